@@ -0,0 +1,116 @@
+"""Per-request cost of the auth dependency.
+
+Drives a minimal in-process FastAPI app whose endpoint reads the user's
+UUID a few times, the way the services do, behind three dependencies:
+
+- none: no auth, the baseline
+- before: what CurrentUser used to be, a sync dependency (one threadpool
+  hop per request) decoding the JWT every time, with get_uuid() parsing
+  the id on every call
+- after: the current CurrentUser, an async dependency backed by the
+  verified-token cache
+
+Requests rotate through --users distinct tokens, so the cache sees the
+hit rate of that many active sessions:
+
+    python -m benchmarks.auth_overhead --requests 5000 --users 100
+"""
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from typing import Annotated
+from uuid import UUID, uuid4
+
+import httpx
+import jwt
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel
+
+from src.auth.service import (ALGORITHM, SECRET_KEY, CurrentUser, create_access_token,
+                              oauth2_bearer, token_cache, verify_token)
+
+
+class LegacyTokenData(BaseModel):
+    user_id: str | None = None
+
+    def get_uuid(self) -> UUID | None:
+        if self.user_id:
+            return UUID(self.user_id)
+        return None
+
+
+def legacy_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> LegacyTokenData:
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return LegacyTokenData(user_id=payload.get("id"))
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/none")
+    async def no_auth():
+        return {"ok": True}
+
+    @app.get("/before")
+    async def before(current_user: Annotated[LegacyTokenData, Depends(legacy_current_user)]):
+        ids = [current_user.get_uuid() for _ in range(3)]
+        return {"ok": ids[0] is not None}
+
+    @app.get("/after")
+    async def after(current_user: CurrentUser):
+        ids = [current_user.get_uuid() for _ in range(3)]
+        return {"ok": ids[0] is not None}
+
+    return app
+
+
+def measure_verify(tokens: list[str], calls: int) -> tuple[float, float]:
+    """Seconds per verify_token call with an empty cache and with a warm one."""
+    started = time.perf_counter()
+    for i in range(calls):
+        token_cache.clear()
+        verify_token(tokens[i % len(tokens)])
+    uncached = (time.perf_counter() - started) / calls
+    started = time.perf_counter()
+    for i in range(calls):
+        verify_token(tokens[i % len(tokens)])
+    return uncached, (time.perf_counter() - started) / calls
+
+
+async def run(mode: str, tokens: list[str], requests: int) -> float:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+        for i in range(min(200, requests)):
+            await client.get(f"/{mode}", headers=headers[i % len(headers)])
+        started = time.perf_counter()
+        for i in range(requests):
+            response = await client.get(f"/{mode}", headers=headers[i % len(headers)])
+            response.raise_for_status()
+        return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=100, help="distinct tokens in rotation")
+    args = parser.parse_args()
+
+    tokens = [create_access_token(f"bench-{i}@example.com", uuid4(), timedelta(hours=1))
+              for i in range(args.users)]
+
+    uncached, cached = measure_verify(tokens, args.requests)
+    print(f"verify_token: {uncached * 1e6:.1f} us uncached, {cached * 1e6:.1f} us cached")
+
+    token_cache.clear()
+    results = {mode: asyncio.run(run(mode, tokens, args.requests))
+               for mode in ("none", "before", "after")}
+    baseline = results["none"]
+    print(f"{'dependency':12} {'us/request':>11} {'overhead':>9}")
+    for mode, seconds in results.items():
+        print(f"{mode:12} {seconds * 1e6:>11.1f} {(seconds - baseline) * 1e6:>+8.1f}")
+
+
+if __name__ == "__main__":
+    main()
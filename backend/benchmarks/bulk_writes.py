@@ -0,0 +1,135 @@
+"""Bulk vs per-item task writes.
+
+Runs the API in-process against the Postgres database in DATABASE_URL
+(migrated to head) and times creating, updating and deleting --items tasks
+through POST/PATCH/DELETE /tasks/bulk versus one POST /tasks/,
+PUT /tasks/{id} or DELETE /tasks/{id} per task, sent --concurrency at a
+time:
+
+    python -m benchmarks.bulk_writes --items 200 --rounds 5
+
+Tasks belong to a `bench-bulk@example.com` user that is removed afterwards.
+"""
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete, select, text
+
+from src.auth.service import create_access_token
+from src.database.core import async_engine, engine
+from src.entities.task import Task
+from src.entities.user import User
+from src.main import app
+
+from .harness import percentile
+
+BENCH_EMAIL = "bench-bulk@example.com"
+
+
+def create_user() -> dict:
+    cleanup()
+    user_id = uuid4()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, first_name, last_name, password) "
+            "VALUES (:id, :email, 'Bench', 'Bulk', 'x')"), {"id": user_id, "email": BENCH_EMAIL})
+    token = create_access_token(BENCH_EMAIL, user_id, timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        bench_users = select(User.id).where(User.email == BENCH_EMAIL)
+        conn.execute(delete(Task).where(Task.user_id.in_(bench_users)))
+        conn.execute(delete(User).where(User.email == BENCH_EMAIL))
+
+
+def new_task(i: int) -> dict:
+    return {"title": f"Bulk benchmark task {i}", "description": "Benchmark task", "total_minutes": 30}
+
+
+async def checked(request) -> httpx.Response:
+    response = await request
+    response.raise_for_status()
+    return response
+
+
+async def per_item(client: httpx.AsyncClient, headers: dict, items: int,
+                   concurrency: int) -> dict[str, float]:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def send(method: str, url: str, **kwargs) -> httpx.Response:
+        async with limit:
+            return await checked(client.request(method, url, headers=headers, **kwargs))
+
+    timings = {}
+    started = time.perf_counter()
+    created = await asyncio.gather(*(send("POST", "/tasks/", json=new_task(i)) for i in range(items)))
+    timings["create"] = time.perf_counter() - started
+    ids = [response.json()["id"] for response in created]
+    started = time.perf_counter()
+    await asyncio.gather(*(send("PUT", f"/tasks/{task_id}", json={"status": "Done"}) for task_id in ids))
+    timings["update"] = time.perf_counter() - started
+    started = time.perf_counter()
+    await asyncio.gather(*(send("DELETE", f"/tasks/{task_id}") for task_id in ids))
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def bulk(client: httpx.AsyncClient, headers: dict, items: int) -> dict[str, float]:
+    timings = {}
+    started = time.perf_counter()
+    created = await checked(client.post("/tasks/bulk", headers=headers, json={
+        "items": [new_task(i) for i in range(items)]}))
+    timings["create"] = time.perf_counter() - started
+    ids = [task["id"] for task in created.json()["items"]]
+    started = time.perf_counter()
+    await checked(client.patch("/tasks/bulk", headers=headers, json={
+        "items": [{"id": task_id, "status": "Done"} for task_id in ids]}))
+    timings["update"] = time.perf_counter() - started
+    started = time.perf_counter()
+    await checked(client.request("DELETE", "/tasks/bulk", headers=headers, json={"ids": ids}))
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def run(headers: dict, items: int, rounds: int, concurrency: int) -> dict:
+    results = {"per-item": [], "bulk": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await per_item(client, headers, min(items, 20), concurrency)  # warm up
+        for _ in range(rounds):
+            results["per-item"].append(await per_item(client, headers, items, concurrency))
+            results["bulk"].append(await bulk(client, headers, items))
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200, help="tasks per operation (bulk max 500)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="per-item requests in flight at once")
+    args = parser.parse_args()
+
+    headers = create_user()
+    try:
+        results = asyncio.run(run(headers, args.items, args.rounds, args.concurrency))
+    finally:
+        cleanup()
+
+    print(f"{args.items} tasks per operation, median of {args.rounds} rounds")
+    print(f"{'operation':10} {'per-item ms':>12} {'bulk ms':>9} {'speedup':>8}")
+    for operation in ("create", "update", "delete"):
+        single = percentile([r[operation] for r in results["per-item"]], 50) * 1000
+        batched = percentile([r[operation] for r in results["bulk"]], 50) * 1000
+        print(f"{operation:10} {single:>12.1f} {batched:>9.1f} {single / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Concurrent request throughput: sync vs async database access.
+
+Drives a minimal in-process FastAPI app whose routes run GET /tasks/'s query
+(plus an optional pg_sleep standing in for a slow query) against the
+Postgres database in DATABASE_URL, three ways:
+
+- sync-threadpool: a `def` route with a sync Session, how the task routes
+  ran before the async port; requests queue for threadpool workers
+- sync-in-async: an `async def` route calling a sync Session, how the daily
+  plan stream saved its progress; every query blocks the event loop
+- async: an `async def` route awaiting an AsyncSession, as routes do now
+
+While the load runs, a task that sleeps 5ms at a time records how late it
+wakes up. That lag is how long the event loop was blocked, which every
+other request and stream on the same worker waits out too:
+
+    python -m benchmarks.db_concurrency --concurrency 50 --requests 2000 --sleep-ms 20
+
+Rows go to a `bench-concurrency@example.com` user that is removed afterwards.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, select, text
+
+from src.database.core import AsyncDbSession, DbSession, SessionLocal, async_engine, engine
+from src.entities.task import Task
+from src.entities.user import User
+
+from .harness import percentile
+
+BENCH_EMAIL = "bench-concurrency@example.com"
+MODES = ("sync-threadpool", "sync-in-async", "async")
+
+
+def load(tasks: int) -> str:
+    cleanup()
+    user_id = uuid4()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, first_name, last_name, password) "
+            "VALUES (:id, :email, 'Bench', 'Concurrency', 'x')"), {"id": user_id, "email": BENCH_EMAIL})
+        conn.execute(text(
+            "INSERT INTO tasks (id, user_id, title, description, status, total_minutes, created_at, updated_at) "
+            "SELECT gen_random_uuid(), :user_id, 'Task ' || g, 'Benchmark task', 'Todo', 30, now(), now() "
+            "FROM generate_series(1, :tasks) AS g"), {"user_id": user_id, "tasks": tasks})
+    return str(user_id)
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        bench_users = select(User.id).where(User.email == BENCH_EMAIL)
+        conn.execute(delete(Task).where(Task.user_id.in_(bench_users)))
+        conn.execute(delete(User).where(User.email == BENCH_EMAIL))
+
+
+def build_app(user_id: str, sleep_seconds: float) -> FastAPI:
+    app = FastAPI()
+    query = select(Task).where(Task.user_id == user_id).order_by(
+        Task.created_at, Task.id).limit(100)
+    slow = text("SELECT pg_sleep(:seconds)").bindparams(seconds=sleep_seconds)
+
+    @app.get("/sync-threadpool")
+    def sync_threadpool(db: DbSession):
+        if sleep_seconds:
+            db.execute(slow)
+        return {"count": len(db.scalars(query).all())}
+
+    @app.get("/sync-in-async")
+    async def sync_in_async():
+        # Its own session, closed before returning: a DbSession dependency
+        # is torn down via the blocked event loop, so once requests
+        # outnumber pooled connections they deadlock until the pool times out
+        with SessionLocal() as db:
+            if sleep_seconds:
+                db.execute(slow)
+            return {"count": len(db.scalars(query).all())}
+
+    @app.get("/async")
+    async def async_route(db: AsyncDbSession):
+        if sleep_seconds:
+            await db.execute(slow)
+        return {"count": len((await db.scalars(query)).all())}
+
+    return app
+
+
+async def run(app: FastAPI, mode: str, concurrency: int, requests: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for _ in range(min(concurrency, requests)):
+            await client.get(f"/{mode}")
+        latencies: list[float] = []
+        lags: list[float] = []
+        remaining = requests
+        finished = asyncio.Event()
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.get(f"/{mode}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        async def monitor():
+            while not finished.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - started - 0.005)
+
+        monitor_task = asyncio.create_task(monitor())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        finished.set()
+        await monitor_task
+    await async_engine.dispose()
+    return {
+        "throughput": requests / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "lag_p95": percentile(lags, 95) * 1000,
+        "lag_max": max(lags, default=0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=100, help="tasks owned by the benchmark user")
+    parser.add_argument("--sleep-ms", type=float, default=20,
+                        help="pg_sleep added to every request to simulate a slow query; 0 disables it")
+    parser.add_argument("--modes", default=",".join(MODES))
+    args = parser.parse_args()
+
+    user_id = load(args.tasks)
+    try:
+        app = build_app(user_id, args.sleep_ms / 1000)
+        results = {mode: asyncio.run(run(app, mode, args.concurrency, args.requests))
+                   for mode in args.modes.split(",")}
+    finally:
+        cleanup()
+
+    print(f"{'mode':16} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'lag p95':>9} {'lag max':>9}")
+    for mode, r in results.items():
+        print(f"{mode:16} {r['throughput']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+              f"{r['lag_p95']:>9.1f} {r['lag_max']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
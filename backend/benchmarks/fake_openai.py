@@ -0,0 +1,93 @@
+"""OpenAI-compatible stand-in for benchmarks.
+
+Serves `POST /v1/chat/completions` (streaming and non-streaming) with a
+configurable time-to-first-token and token rate, so AI routes can be load
+tested without calling (or paying for) the real API:
+
+    FAKE_OPENAI_TTFT_MS=300 FAKE_OPENAI_TOKENS_PER_SECOND=50 \\
+        uvicorn benchmarks.fake_openai:app --port 8100
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+TTFT_MS = float(os.getenv("FAKE_OPENAI_TTFT_MS", "300"))
+TOKENS_PER_SECOND = float(os.getenv("FAKE_OPENAI_TOKENS_PER_SECOND", "50"))
+COMPLETION_TOKENS = int(os.getenv("FAKE_OPENAI_COMPLETION_TOKENS", "200"))
+
+WORDS = (
+    "## Plan\n\n", "- Review ", "the ", "task ", "backlog ", "and ",
+    "estimate ", "each ", "item ", "(30 min)\n", "- Pair ", "on ",
+    "**implementation** ", "details\n", "- Write ", "tests\n\n",
+)
+
+app = FastAPI(title="Fake OpenAI")
+stats = {"requests": 0, "streams": 0, "tokens": 0}
+
+
+def _tokens() -> list[str]:
+    return [WORDS[i % len(WORDS)] for i in range(COMPLETION_TOKENS)]
+
+
+def _usage() -> dict:
+    return {"prompt_tokens": 0, "completion_tokens": COMPLETION_TOKENS,
+            "total_tokens": COMPLETION_TOKENS}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "gpt-3.5-turbo")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    tokens = _tokens()
+    stats["requests"] += 1
+    stats["tokens"] += len(tokens)
+
+    if not body.get("stream"):
+        await asyncio.sleep(TTFT_MS / 1000 + len(tokens) / TOKENS_PER_SECOND)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "".join(tokens)}}],
+            "usage": _usage(),
+        }
+
+    stats["streams"] += 1
+
+    def chunk(delta: dict, finish_reason: str | None = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def stream():
+        await asyncio.sleep(TTFT_MS / 1000)
+        yield chunk({"role": "assistant", "content": ""})
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(1 / TOKENS_PER_SECOND)
+            yield chunk({"content": token})
+        yield chunk({}, "stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
@@ -0,0 +1,314 @@
+"""Load-test harness for the SprintSync API.
+
+Starts the fake OpenAI server and the app (wrapped with per-route SQL
+counters) against the Postgres database in DATABASE_URL, drives a weighted
+mix of auth, tasks and AI routes at a fixed concurrency, then prints and
+saves latency percentiles, throughput and DB query counts per route:
+
+    python -m benchmarks.harness --concurrency 20 --duration 30 \\
+        --output benchmarks/results/baseline.json
+
+    python -m benchmarks.harness --compare old.json new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Relative share of requests per route in the default mix
+DEFAULT_WEIGHTS = {
+    "POST /auth/login": 2,
+    "GET /users/me": 5,
+    "GET /tasks/": 30,
+    "GET /tasks/{task_id}": 15,
+    "POST /tasks/": 10,
+    "PUT /tasks/{task_id}": 15,
+    "POST /ai/suggest": 5,
+    "GET /ai/daily-plan": 15,
+    "POST /ai/daily-plan/generate": 3,
+}
+
+
+@dataclass
+class BenchUser:
+    email: str
+    password: str
+    token: str = ""
+    task_ids: list[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    seconds: float
+    first_byte_seconds: float
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def start_server(module: str, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module, "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env)
+
+
+async def timed(client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Sample:
+    started = time.perf_counter()
+    first_byte = None
+    async with client.stream(method, url, **kwargs) as response:
+        async for _ in response.aiter_raw():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+        status = response.status_code
+    elapsed = time.perf_counter() - started
+    return Sample(route, status, elapsed, first_byte if first_byte is not None else elapsed)
+
+
+async def call_route(client: httpx.AsyncClient, route: str, user: BenchUser, titles: list[str]) -> Sample:
+    if route == "POST /auth/login":
+        return await timed(client, route, "POST", "/auth/login",
+                           data={"username": user.email, "password": user.password})
+    if route == "GET /users/me":
+        return await timed(client, route, "GET", "/users/me", headers=user.headers)
+    if route == "GET /tasks/":
+        return await timed(client, route, "GET", "/tasks/", headers=user.headers)
+    if route == "GET /tasks/{task_id}":
+        return await timed(client, route, "GET", f"/tasks/{random.choice(user.task_ids)}",
+                           headers=user.headers)
+    if route == "POST /tasks/":
+        return await timed(client, route, "POST", "/tasks/", headers=user.headers,
+                           json={"title": random.choice(titles), "description": "Benchmark task",
+                                 "total_minutes": random.randint(15, 240)})
+    if route == "PUT /tasks/{task_id}":
+        return await timed(client, route, "PUT", f"/tasks/{random.choice(user.task_ids)}",
+                           headers=user.headers,
+                           json={"status": random.choice(["Todo", "In Progress", "Done"])})
+    if route == "POST /ai/suggest":
+        return await timed(client, route, "POST", "/ai/suggest", headers=user.headers,
+                           json={"title": random.choice(titles)})
+    if route == "GET /ai/daily-plan":
+        return await timed(client, route, "GET", "/ai/daily-plan", headers=user.headers)
+    if route == "POST /ai/daily-plan/generate":
+        return await timed(client, route, "POST", "/ai/daily-plan/generate", headers=user.headers)
+    raise ValueError(f"Unknown route {route}")
+
+
+async def setup_users(client: httpx.AsyncClient, count: int, tasks_per_user: int,
+                      titles: list[str]) -> list[BenchUser]:
+    run_id = uuid.uuid4().hex[:8]
+    users = [BenchUser(email=f"bench-{run_id}-{i}@example.com", password="benchpassword")
+             for i in range(count)]
+    for user in users:
+        response = await client.post("/auth/register", json={
+            "email": user.email, "first_name": "Bench", "last_name": "User",
+            "password": user.password})
+        response.raise_for_status()
+        response = await client.post("/auth/login", data={
+            "username": user.email, "password": user.password})
+        response.raise_for_status()
+        user.token = response.json()["access_token"]
+        for _ in range(tasks_per_user):
+            response = await client.post("/tasks/", headers=user.headers, json={
+                "title": random.choice(titles), "description": "Benchmark task",
+                "total_minutes": random.randint(15, 240)})
+            response.raise_for_status()
+            user.task_ids.append(response.json()["id"])
+    return users
+
+
+async def run_load(client: httpx.AsyncClient, users: list[BenchUser], weights: dict,
+                   duration: float, titles: list[str]) -> list[Sample]:
+    routes = list(weights)
+    route_weights = [weights[route] for route in routes]
+    samples: list[Sample] = []
+    deadline = time.monotonic() + duration
+
+    async def worker(user: BenchUser):
+        while time.monotonic() < deadline:
+            route = random.choices(routes, route_weights)[0]
+            try:
+                samples.append(await call_route(client, route, user, titles))
+            except httpx.HTTPError:
+                samples.append(Sample(route, 0, 0.0, 0.0))
+
+    await asyncio.gather(*(worker(user) for user in users))
+    return samples
+
+
+def summarize(samples: list[Sample], query_stats: dict, duration: float) -> dict:
+    routes: dict[str, dict] = {}
+    for route in sorted({sample.route for sample in samples}):
+        route_samples = [s for s in samples if s.route == route]
+        ok = [s for s in route_samples if 200 <= s.status < 400]
+        latencies = [s.seconds * 1000 for s in ok]
+        first_bytes = [s.first_byte_seconds * 1000 for s in ok]
+        queries = query_stats.get(route, {})
+        served = queries.get("requests", 0)
+        routes[route] = {
+            "requests": len(route_samples),
+            "errors": len(route_samples) - len(ok),
+            "throughput_rps": len(route_samples) / duration,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "ttfb_p50_ms": percentile(first_bytes, 50),
+            "queries_per_request": queries.get("queries", 0) / served if served else None,
+            "query_ms_per_request": queries.get("query_seconds", 0) * 1000 / served if served else None,
+        }
+    return {
+        "total_requests": len(samples),
+        "throughput_rps": len(samples) / duration,
+        "routes": routes,
+    }
+
+
+def print_report(report: dict) -> None:
+    header = f"{'route':32} {'reqs':>6} {'err':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6}"
+    print(header)
+    print("-" * len(header))
+    for route, stats in report["routes"].items():
+        queries = stats["queries_per_request"]
+        print(f"{route:32} {stats['requests']:>6} {stats['errors']:>5} "
+              f"{stats['throughput_rps']:>7.1f} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+              f"{queries if queries is None else round(queries, 2)!s:>6}")
+    print(f"\ntotal: {report['total_requests']} requests, {report['throughput_rps']:.1f} req/s")
+
+
+def compare(old_path: str, new_path: str) -> None:
+    old = json.loads(Path(old_path).read_text())["results"]["routes"]
+    new = json.loads(Path(new_path).read_text())["results"]["routes"]
+    print(f"{'route':32} {'p50':>18} {'p95':>18} {'rps':>16}")
+    for route in sorted(set(old) | set(new)):
+        if route not in old or route not in new:
+            continue
+        a, b = old[route], new[route]
+        print(f"{route:32} {a['p50_ms']:>8.1f}->{b['p50_ms']:<8.1f} "
+              f"{a['p95_ms']:>8.1f}->{b['p95_ms']:<8.1f} "
+              f"{a['throughput_rps']:>7.1f}->{b['throughput_rps']:<7.1f}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    weights = dict(DEFAULT_WEIGHTS)
+    if args.routes:
+        weights = {route: weights[route] for route in args.routes.split(",")}
+    titles = [f"Benchmark task {i}" for i in range(args.distinct_titles)]
+
+    openai_port, app_port = free_port(), free_port()
+    env = {
+        **os.environ,
+        "FAKE_OPENAI_TTFT_MS": str(args.ttft_ms),
+        "FAKE_OPENAI_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_OPENAI_COMPLETION_TOKENS": str(args.completion_tokens),
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+        "OPENAI_KEY": os.getenv("OPENAI_KEY") or "benchmark",
+    }
+    if args.migrate:
+        subprocess.run(["alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True)
+
+    servers = [start_server("benchmarks.fake_openai:app", openai_port, env),
+               start_server("benchmarks.instrumented_app:app", app_port, env)]
+    try:
+        base_url = f"http://127.0.0.1:{app_port}"
+        await wait_until_up(f"http://127.0.0.1:{openai_port}/stats")
+        await wait_until_up(f"{base_url}/__bench/queries")
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+            users = await setup_users(client, args.concurrency, args.tasks_per_user, titles)
+            if args.warmup:
+                await run_load(client, users, weights, args.warmup, titles)
+            await client.delete("/__bench/queries")
+
+            started = time.monotonic()
+            samples = await run_load(client, users, weights, args.duration, titles)
+            elapsed = time.monotonic() - started
+            query_stats = (await client.get("/__bench/queries")).json()
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    report = summarize(samples, query_stats, elapsed)
+    print_report(report)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        config = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+        output.write_text(json.dumps({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": {**config, "weights": weights},
+            "results": report,
+        }, indent=2))
+        print(f"saved {output}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20,
+                        help="concurrent virtual users (each its own account)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--routes", help="comma-separated subset of: " + ", ".join(DEFAULT_WEIGHTS))
+    parser.add_argument("--tasks-per-user", type=int, default=20)
+    parser.add_argument("--distinct-titles", type=int, default=50,
+                        help="size of the task title pool (affects suggest cache hits)")
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--completion-tokens", type=int, default=200)
+    parser.add_argument("--migrate", action="store_true", help="run alembic upgrade head first")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="diff two saved result files and exit")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.compare:
+        compare(*arguments.compare)
+    else:
+        asyncio.run(main(arguments))
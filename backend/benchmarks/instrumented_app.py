@@ -0,0 +1,65 @@
+"""The SprintSync app wrapped with per-route SQL statement counting.
+
+Served by the benchmark harness in place of `src.main:app`; the counters are
+read (and reset) through `GET /__bench/queries`.
+"""
+import time
+from contextvars import ContextVar
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+
+from src.database.core import async_engine
+from src.main import app as sprintsync_app
+
+_current: ContextVar[dict | None] = ContextVar("bench_query_counter", default=None)
+route_stats: dict[str, dict] = {}
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["bench_started"].pop()
+    counter = _current.get()
+    if counter is not None:
+        counter["queries"] += 1
+        counter["query_seconds"] += time.perf_counter() - started
+
+
+class QueryCountingApp:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == "/__bench/queries":
+            await self._report(scope, receive, send)
+            return
+        counter = {"queries": 0, "query_seconds": 0.0}
+        token = _current.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            label = f"{scope['method']} {route.path if route else scope['path']}"
+            totals = route_stats.setdefault(
+                label, {"requests": 0, "queries": 0, "query_seconds": 0.0})
+            totals["requests"] += 1
+            totals["queries"] += counter["queries"]
+            totals["query_seconds"] += counter["query_seconds"]
+
+    async def _report(self, scope, receive, send):
+        response = JSONResponse(route_stats)
+        if scope["method"] == "DELETE":
+            route_stats.clear()
+        await response(scope, receive, send)
+
+
+app = QueryCountingApp(sprintsync_app)
@@ -0,0 +1,87 @@
+"""Request overhead of the logging pipeline.
+
+Drives a minimal in-process FastAPI app whose endpoint logs one INFO line
+with arguments, the way the service layer does, under several logging
+setups. Output goes to a real temp file so write cost is included:
+
+    python -m benchmarks.logging_overhead --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+
+import src.logger as app_logger
+
+logger = logging.getLogger("bench.service.reads")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    user_id = uuid4()
+
+    @app.get("/")
+    async def endpoint():
+        logger.info("Retrieved %d tasks for user: %s", 25, user_id)
+        return {"ok": True}
+
+    return app
+
+
+def configure(mode: str, path: str) -> None:
+    """Point the root logger at `path` using the given setup."""
+    app_logger._stop_listener()
+    if mode == "off":
+        logging.basicConfig(level=logging.WARNING, handlers=[logging.FileHandler(path)], force=True)
+    elif mode == "sync-text":
+        # What configure_logging used to install: formatting and writing inline
+        logging.basicConfig(level=logging.INFO, handlers=[logging.FileHandler(path)], force=True)
+    else:
+        app_logger.LOG_FORMAT = "json"
+        app_logger.LOG_SAMPLE_RATES = {"bench.service.reads": 0.1} if mode == "queue-json-sampled" else {}
+        app_logger.configure_logging("INFO")
+        # Swap the listener's stderr handler for the file
+        listener = app_logger._listener
+        listener.stop()
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(app_logger.JsonFormatter())
+        listener.handlers = (file_handler,)
+        listener.start()
+
+
+async def run(requests: int) -> float:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):
+            await client.get("/")
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/")
+        return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("off", "sync-text", "queue-json", "queue-json-sampled"):
+        with tempfile.NamedTemporaryFile(suffix=".log") as log_file:
+            configure(mode, log_file.name)
+            results[mode] = asyncio.run(run(args.requests))
+            app_logger._stop_listener()
+
+    baseline = results["off"]
+    print(f"{'mode':20} {'us/request':>11} {'overhead':>9}")
+    for mode, seconds in results.items():
+        print(f"{mode:20} {seconds * 1e6:>11.1f} {(seconds - baseline) * 1e6:>+8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Login throughput with bcrypt on the event loop vs the password pool.
+
+Runs the API in-process against the Postgres database in DATABASE_URL
+(migrated to head) and sends --requests POST /auth/login calls,
+--concurrency at a time, two ways:
+
+- event-loop: bcrypt verifies inline in the async route, how login worked
+  before the password pool; every verify blocks the event loop
+- pool: verifies run on the bounded password_hash_executor, as now;
+  requests past PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT get a 503
+
+As in db_concurrency, a task that sleeps 5ms at a time records how late it
+wakes up, i.e. how long every other request on the worker was stalled:
+
+    python -m benchmarks.login_throughput --concurrency 20 --requests 200
+
+Logins use a `bench-login@example.com` user that is removed afterwards.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete, text
+
+from src.auth import service
+from src.database.core import async_engine, engine
+from src.entities.user import User
+from src.main import app
+
+from .harness import percentile
+
+BENCH_EMAIL = "bench-login@example.com"
+BENCH_PASSWORD = "bench-password"
+MODES = ("event-loop", "pool")
+
+
+def create_user() -> None:
+    cleanup()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, first_name, last_name, password) "
+            "VALUES (:id, :email, 'Bench', 'Login', :password)"),
+            {"id": uuid4(), "email": BENCH_EMAIL, "password": service.get_password_hash(BENCH_PASSWORD)})
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(User).where(User.email == BENCH_EMAIL))
+
+
+async def verify_on_event_loop(plain_password: str, hashed_password: str) -> bool:
+    return service.verify_password(plain_password, hashed_password)
+
+
+async def run(mode: str, concurrency: int, requests: int) -> dict:
+    pooled = service.verify_password_async
+    if mode == "event-loop":
+        service.verify_password_async = verify_on_event_loop
+    latencies: list[float] = []
+    lags: list[float] = []
+    statuses: dict[int, int] = {}
+    remaining = requests
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            finished = asyncio.Event()
+
+            async def worker():
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    started = time.perf_counter()
+                    response = await client.post("/auth/login", data={
+                        "username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - started)
+
+            async def monitor():
+                while not finished.is_set():
+                    started = time.perf_counter()
+                    await asyncio.sleep(0.005)
+                    lags.append(time.perf_counter() - started - 0.005)
+
+            monitor_task = asyncio.create_task(monitor())
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+            finished.set()
+            await monitor_task
+    finally:
+        service.verify_password_async = pooled
+        await async_engine.dispose()
+    unexpected = set(statuses) - {200, 503}
+    if unexpected:
+        raise RuntimeError(f"Unexpected login responses: {statuses}")
+    return {
+        "logins_per_second": statuses.get(200, 0) / elapsed,
+        "rejected": statuses.get(503, 0),
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "lag_p95": percentile(lags, 95) * 1000,
+        "lag_max": max(lags, default=0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--modes", default=",".join(MODES))
+    args = parser.parse_args()
+
+    create_user()
+    try:
+        results = {mode: asyncio.run(run(mode, args.concurrency, args.requests))
+                   for mode in args.modes.split(",")}
+    finally:
+        cleanup()
+
+    print(f"{args.requests} logins, {args.concurrency} concurrent, "
+          f"{service.PASSWORD_HASH_WORKERS} pool workers")
+    print(f"{'mode':12} {'logins/s':>9} {'503s':>6} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'lag p95':>9} {'lag max':>9}")
+    for mode, r in results.items():
+        print(f"{mode:12} {r['logins_per_second']:>9.1f} {r['rejected']:>6} {r['p50']:>8.1f} "
+              f"{r['p95']:>8.1f} {r['lag_p95']:>9.1f} {r['lag_max']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
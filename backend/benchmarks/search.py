@@ -0,0 +1,137 @@
+"""Task search: tsvector + GIN vs ILIKE scanning.
+
+Loads a synthetic task set into the Postgres database in DATABASE_URL
+(migrated to head), then times GET /tasks/search's query against the
+ILIKE filter a client-side search would otherwise need, for words of
+different frequency:
+
+    python -m benchmarks.search --rows 3000000 --users 10
+
+Rows go to `bench-search-*@example.com` users, which are removed afterwards
+unless --keep is given. Later runs with --keep --skip-load reuse them.
+"""
+import argparse
+import asyncio
+import random
+import time
+from itertools import product
+
+from sqlalchemy import delete, or_, select, text
+
+from src.auth.models import TokenData
+from src.database.core import AsyncSessionLocal, async_engine, engine
+from src.entities.task import Task
+from src.entities.user import User
+from src.tasks import models, service
+
+from .harness import percentile
+
+# Pronounceable made-up words, so stemming treats them consistently
+VOCABULARY = ["".join(parts) for parts in product(
+    ["b", "d", "k", "l", "m", "p", "r", "s", "t", "v"],
+    ["a", "e", "i", "o", "u"],
+    ["n", "r", "s", "x"],
+    ["a", "o", "u", "el", "in"])]  # 1000 words
+
+# Word index ranges by frequency; rows draw words skewed towards low indexes
+BANDS = {"common": (0, 10), "medium": (100, 200), "rare": (900, 1000)}
+
+
+def load(rows: int, users: int, batch: int = 250_000) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, first_name, last_name, password) "
+            "SELECT gen_random_uuid(), 'bench-search-' || g || '@example.com', 'Bench', 'Search', 'x' "
+            "FROM generate_series(1, :users) AS g"), {"users": users})
+    user_ids = "ARRAY(SELECT id FROM users WHERE email LIKE 'bench-search-%' ORDER BY email)"
+    # power(random(), 3) skews towards the start of the vocabulary
+    word = "(:words)[1 + floor(power(random(), 3) * :vocabulary)::int]"
+    loaded = 0
+    while loaded < rows:
+        count = min(batch, rows - loaded)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(text(f"""
+                INSERT INTO tasks (id, user_id, title, description, status, total_minutes, created_at, updated_at)
+                SELECT gen_random_uuid(), bench.user_ids[1 + g % :users],
+                       concat_ws(' ', {word}, {word}, {word}),
+                       concat_ws(' ', {', '.join([word] * 12)}),
+                       (ARRAY['Todo', 'InProgress', 'Done'])[1 + g % 3],
+                       15 * (1 + g % 8),
+                       now() - g * interval '1 second', now()
+                FROM generate_series(1, :count) AS g, (SELECT {user_ids} AS user_ids) AS bench
+            """), {"words": VOCABULARY, "vocabulary": len(VOCABULARY),
+                   "users": users, "count": count})
+        loaded += count
+        print(f"loaded {loaded}/{rows} rows ({time.perf_counter() - started:.1f}s per batch)")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE tasks"))
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        bench_users = select(User.id).where(User.email.like("bench-search-%"))
+        conn.execute(delete(Task).where(Task.user_id.in_(bench_users)))
+        conn.execute(delete(User).where(User.email.like("bench-search-%")))
+
+
+async def ilike_search(db, user_id, q: str, limit: int):
+    pattern = f"%{q}%"
+    result = await db.execute(select(Task).where(
+        Task.user_id == user_id,
+        or_(Task.title.ilike(pattern), Task.description.ilike(pattern)),
+    ).order_by(Task.created_at, Task.id).limit(limit))
+    return result.scalars().all()
+
+
+async def measure(queries: int, limit: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        user_ids = (await db.scalars(
+            select(User.id).where(User.email.like("bench-search-%")))).all()
+        results = {}
+        for band, (low, high) in BANDS.items():
+            timings = {"tsvector": [], "ilike": []}
+            for _ in range(queries):
+                q = VOCABULARY[random.randrange(low, high)]
+                user_id = random.choice(user_ids)
+                started = time.perf_counter()
+                await service.search_tasks(TokenData(user_id=str(user_id)), db,
+                                           models.TaskSearchParams(q=q, limit=limit))
+                timings["tsvector"].append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                await ilike_search(db, user_id, q, limit)
+                timings["ilike"].append((time.perf_counter() - started) * 1000)
+            results[band] = timings
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--users", type=int, default=10,
+                        help="rows are spread evenly, so fewer users means larger per-user scans")
+    parser.add_argument("--queries", type=int, default=30, help="queries per frequency band")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true", help="reuse rows kept by an earlier run")
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic rows in place")
+    args = parser.parse_args()
+
+    if not args.skip_load:
+        cleanup()
+        load(args.rows, args.users)
+    try:
+        results = asyncio.run(measure(args.queries, args.limit))
+    finally:
+        if not args.keep:
+            cleanup()
+
+    print(f"{'band':8} {'method':9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for band, timings in results.items():
+        for method, values in timings.items():
+            print(f"{band:8} {method:9} {percentile(values, 50):>8.1f} "
+                  f"{percentile(values, 95):>8.1f} {max(values):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
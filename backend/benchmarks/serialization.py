@@ -0,0 +1,78 @@
+"""Cost of serializing task lists, per 1,000 rows.
+
+Drives a minimal in-process FastAPI app (no database) that returns the same
+preloaded tasks two ways:
+
+- response_model: Task entities through response_model=List[TaskResponse],
+  the default path (per-row validation, jsonable_encoder, json.dumps)
+- fast: plain row dicts encoded by task_rows_adapter, the
+  FAST_LIST_RESPONSES path
+
+    python -m benchmarks.serialization --rows 1000 --requests 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+
+from src.entities.task import Status, Task
+from src.serialization import typed_json_response
+from src.tasks import models
+
+
+def build_app(rows: int) -> FastAPI:
+    app = FastAPI()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    user_id = uuid4()
+    entities = [Task(id=uuid4(), user_id=user_id, title=f"Task {i}",
+                     description="Write up the quarterly numbers for the review. " * 3,
+                     status=list(Status)[i % 3], total_minutes=15 * (1 + i % 8),
+                     created_at=now - timedelta(minutes=i), updated_at=now)
+                for i in range(rows)]
+    row_dicts = [{name: getattr(task, name) for name in models.TASK_FIELDS} for task in entities]
+
+    @app.get("/response_model", response_model=List[models.TaskResponse])
+    async def response_model():
+        return entities
+
+    @app.get("/fast")
+    async def fast():
+        return typed_json_response(models.task_rows_adapter, row_dicts)
+
+    return app
+
+
+async def run(app: FastAPI, mode: str, requests: int) -> tuple[float, int]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(20, requests)):
+            await client.get(f"/{mode}")
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(f"/{mode}")
+        return (time.perf_counter() - started) / requests, len(response.content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = build_app(args.rows)
+    results = {mode: asyncio.run(run(app, mode, args.requests)) for mode in ("response_model", "fast")}
+    print(f"{'path':16} {'ms/1k rows':>11} {'KB/1k rows':>11}")
+    for mode, (seconds, size) in results.items():
+        print(f"{mode:16} {seconds * 1000 * 1000 / args.rows:>11.2f} "
+              f"{size / 1024 * 1000 / args.rows:>11.1f}")
+    baseline = results["response_model"][0]
+    print(f"fast path: {baseline / results['fast'][0]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""add composite indexes for hot queries
+
+Revision ID: 1d99249eb22f
+Revises: 4b3dcfb3e9fd
+Create Date: 2026-10-18 09:12:41.503817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d99249eb22f'
+down_revision: Union[str, Sequence[str], None] = '4b3dcfb3e9fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every task query is scoped by user_id; the daily plan generator also
+    # filters on status, which the second column covers.
+    op.create_index('ix_tasks_user_id_status', 'tasks',
+                    ['user_id', 'status'])
+    # Today's plan lookup/delete and the history listing (ordered by date).
+    op.create_index('ix_daily_plans_user_id_date', 'daily_plans',
+                    ['user_id', 'date'])
+    # Latest plan for a user (ORDER BY created_at DESC LIMIT 1).
+    op.create_index('ix_daily_plans_user_id_created_at', 'daily_plans',
+                    ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_plans_user_id_created_at',
+                  table_name='daily_plans')
+    op.drop_index('ix_daily_plans_user_id_date', table_name='daily_plans')
+    op.drop_index('ix_tasks_user_id_status', table_name='tasks')
@@ -0,0 +1,28 @@
+"""add daily plan input fingerprint
+
+Revision ID: 34532414b67e
+Revises: c3eec4cbc3fa
+Create Date: 2026-10-18 20:04:51.562310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '34532414b67e'
+down_revision: Union[str, Sequence[str], None] = 'c3eec4cbc3fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('daily_plans', sa.Column('input_fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('daily_plans', 'input_fingerprint')
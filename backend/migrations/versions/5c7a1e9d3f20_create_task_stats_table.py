@@ -0,0 +1,42 @@
+"""create task stats table
+
+Revision ID: 5c7a1e9d3f20
+Revises: 9e2f6c4b8a1d
+Create Date: 2026-10-18 20:31:08.415276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7a1e9d3f20'
+down_revision: Union[str, Sequence[str], None] = '9e2f6c4b8a1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        # Same storage as tasks.status: the Status member name
+        sa.Column('status', sa.String(), primary_key=True),
+        sa.Column('task_count', sa.Integer, nullable=False),
+        sa.Column('total_minutes', sa.Integer, nullable=False),
+    )
+    # Tasks written while this runs are caught by the reconcile command
+    op.execute(
+        "INSERT INTO task_stats (user_id, status, task_count, total_minutes) "
+        "SELECT user_id, status, count(*), coalesce(sum(total_minutes), 0) "
+        "FROM tasks GROUP BY user_id, status")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_stats')
@@ -0,0 +1,29 @@
+"""add tasks keyset pagination index
+
+Revision ID: c3eec4cbc3fa
+Revises: 1d99249eb22f
+Create Date: 2026-10-18 10:03:27.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3eec4cbc3fa'
+down_revision: Union[str, Sequence[str], None] = '1d99249eb22f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Matches the GET /tasks ordering so each page is a single index range scan.
+    op.create_index('ix_tasks_user_id_created_at_id', 'tasks',
+                    ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
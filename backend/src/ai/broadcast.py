@@ -0,0 +1,76 @@
+import asyncio
+from bisect import bisect_right
+from typing import AsyncGenerator
+
+
+class StreamBroadcast:
+    """Buffers the chunks of one upstream stream so any number of readers
+    can follow it, each starting from whichever chunk offset they choose."""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        # Character offset at which each chunk ends, for resuming mid-text
+        self.ends: list[int] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    async def publish(self, chunk: str) -> None:
+        async with self._changed:
+            self.chunks.append(chunk)
+            self.ends.append((self.ends[-1] if self.ends else 0) + len(chunk))
+            self._changed.notify_all()
+
+    async def finish(self, error: BaseException | None = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def started(self) -> None:
+        """Wait until the stream has produced its first chunk or ended.
+        Raises the stream's error if it failed before producing anything."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.chunks or self.done)
+        if not self.chunks and self.error is not None:
+            raise self.error
+
+    async def wait(self) -> str:
+        """Wait for the stream to finish and return its full text."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+    async def subscribe(self, offset: int = 0) -> AsyncGenerator[str, None]:
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: offset < len(self.chunks) or self.done)
+                pending = self.chunks[offset:]
+                done = self.done
+            for chunk in pending:
+                yield chunk
+            offset += len(pending)
+            if done:
+                if self.error is not None:
+                    raise self.error
+                return
+
+    async def follow(self, position: int = 0) -> AsyncGenerator[tuple[int, str], None]:
+        """Like `subscribe`, but starting from a character offset into the
+        text and yielding `(end_offset, text)` pairs, so a reader can hand
+        the offset out as an event id and resume from it later."""
+        index = bisect_right(self.ends, position)
+        async for chunk in self.subscribe(index):
+            end = self.ends[index]
+            start = end - len(chunk)
+            index += 1
+            if start < position:
+                chunk = chunk[position - start:]
+            yield end, chunk
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from src.database.core import DbSession
+from src.database.core import AsyncDbSession
 from src.entities.daily_plan import DailyPlan
-from .models import SuggestRequest, DailyPlanResponse
-from .service import ai_suggest_stream, get_daily_plan_for_user, stream_generate_and_save_daily_plan, get_all_daily_plans_for_user
+from .models import SuggestRequest, DailyPlanResponse, daily_plan_history_adapter
+from .service import ai_suggest_stream, get_daily_plan_for_user, start_daily_plan_job, get_all_daily_plans_for_user, suggest_cache, get_daily_plan_etag, get_daily_plan_history_etag, get_daily_plan_history_rows, get_daily_plan_job, get_todays_daily_plan, llm
 from src.auth.service import CurrentUser
+from src.etags import etag_matches, not_modified
+from src.serialization import FAST_LIST_RESPONSES, typed_json_response
 from datetime import date as dt_date
+from typing import Annotated, Literal
+from .sse import coalesce, json_data, sse_error_event, sse_event, sse_text_events, started
 import base64
 
 router = APIRouter(
@@ -16,23 +19,60 @@ router = APIRouter(
 
 
 @router.post("/suggest")
-async def suggest(suggest_request: SuggestRequest, current_user: CurrentUser):
+async def suggest(suggest_request: SuggestRequest, current_user: CurrentUser,
+                  framing: Annotated[Literal["base64", "json"], Query()] = "base64"):
+    """`framing=json` batches deltas and sends each frame's text as a JSON
+    string; the default base64-per-delta framing is kept for older clients.
+
+    Failures before the first chunk are returned as 503/504 responses; a
+    failure after it ends the stream with an `error` event.
+    """
+    chunks = await started(ai_suggest_stream(suggest_request, current_user))
+
     async def event_stream():
-        async for chunk in ai_suggest_stream(suggest_request, current_user):
-            encoded = base64.b64encode(chunk.encode('utf-8')).decode('utf-8')
-            yield f"data: {encoded}\n\n"
+        event_id = 0
+        try:
+            if framing == "json":
+                async for text in coalesce(chunks):
+                    event_id += 1
+                    yield sse_event(json_data(text), event_id)
+                return
+            async for chunk in chunks:
+                event_id += 1
+                encoded = base64.b64encode(chunk.encode('utf-8')).decode('utf-8')
+                yield sse_event(encoded, event_id)
+        except Exception as e:
+            yield sse_error_event(e)
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
+@router.get("/suggest/stats")
+async def suggest_stats(current_user: CurrentUser):
+    return suggest_cache.stats()
+
+
+@router.get("/llm/stats")
+async def llm_stats(current_user: CurrentUser):
+    return llm.stats()
+
+
 @router.get("/daily-plan", response_model=DailyPlanResponse)
 async def get_daily_plan(
     current_user: CurrentUser,
-    db: DbSession,
+    db: AsyncDbSession,
+    request: Request,
+    response: Response,
 ):
     user_id = current_user.get_uuid()
+    etag = await get_daily_plan_etag(user_id, db)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Daily plan not found.")
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
     daily_plan = await get_daily_plan_for_user(user_id, db)
     if not daily_plan:
         raise HTTPException(status_code=404, detail="Daily plan not found.")
+    response.headers["ETag"] = etag
     return DailyPlanResponse(
         user_id=daily_plan.user_id,
         date=daily_plan.date,
@@ -41,17 +81,65 @@ async def get_daily_plan(
 
 
 @router.post("/daily-plan/generate")
-async def generate_daily_plan(current_user: CurrentUser, db: DbSession):
+async def generate_daily_plan(current_user: CurrentUser, db: AsyncDbSession,
+                              last_event_id: Annotated[str | None, Header()] = None,
+                              force: Annotated[bool, Query()] = False,
+                              mode: Annotated[Literal["llm", "local", "polished"], Query()] = "llm"):
+    """Each event's id is the character offset of the plan text after it.
+
+    A reconnect sending Last-Event-ID resumes from that offset: first from
+    the in-memory job buffer, else from the plan already saved today. It
+    never starts a second generation.
+
+    If today's plan was generated from the same tasks it is streamed back
+    without calling the LLM; `force=true` regenerates it anyway.
+
+    `mode=local` builds the plan with the local scheduler in milliseconds,
+    and `mode=polished` has the LLM reword that schedule. A request that
+    joins a generation already running gets that generation's mode.
+
+    A generation that fails before its first chunk fails the request
+    (502/503/504); one that fails later ends the stream with an `error` event.
+    """
+    position = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    if position is None:
+        # Joins the user's in-progress generation if there is one; the
+        # content streamed so far is replayed before the live output.
+        job = start_daily_plan_job(current_user, force, mode)
+    else:
+        job = get_daily_plan_job(current_user)
+
+    if job is None:
+        plan = await get_todays_daily_plan(current_user.get_uuid(), db)
+        if plan is None:
+            raise HTTPException(status_code=404, detail="Daily plan not found.")
+        return StreamingResponse(sse_text_events(plan.plan, position),
+                                 media_type="text/event-stream")
+
+    # A generation that fails before producing anything (e.g. a 503 from
+    # a full LLM queue) fails the request instead of an empty 200 stream
+    await job.started()
+
     async def event_stream():
-        async for chunk in stream_generate_and_save_daily_plan(current_user, db):
-            yield f"data: {chunk}\n\n"
+        try:
+            async for end, chunk in job.follow(position or 0):
+                yield sse_event(chunk, end)
+        except Exception as e:
+            yield sse_error_event(e)
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @router.get("/daily-plan/history")
-async def get_daily_plan_history(current_user: CurrentUser, db: DbSession):
+async def get_daily_plan_history(current_user: CurrentUser, db: AsyncDbSession, request: Request, response: Response):
     user_id = current_user.get_uuid()
-    plans = get_all_daily_plans_for_user(user_id, db)
+    etag = await get_daily_plan_history_etag(user_id, db)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    if FAST_LIST_RESPONSES:
+        rows = await get_daily_plan_history_rows(user_id, db)
+        return typed_json_response(daily_plan_history_adapter, rows, {"ETag": etag})
+    response.headers["ETag"] = etag
+    plans = await get_all_daily_plans_for_user(user_id, db)
     return [
         {"user_id": p.user_id, "date": p.date, "plan": p.plan,
             "created_at": p.created_at, "updated_at": p.updated_at}
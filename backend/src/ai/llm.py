@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import random
+import time
+from typing import AsyncGenerator, AsyncIterator, Protocol
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from src.exceptions import ServiceBusyError, UpstreamTimeoutError
+from src.metrics import (LLM_CALLS, LLM_QUEUE_WAIT, LLM_REQUESTS_IN_FLIGHT, LLM_STREAM_DURATION,
+                         LLM_TIME_TO_FIRST_TOKEN, LLM_TOKENS_PER_SECOND)
+
+Messages = list[dict[str, str]]
+
+
+class LLMProvider(Protocol):
+    """A chat completion backend. `stream` yields content deltas only."""
+
+    def stream(self, model: str, messages: Messages) -> AsyncIterator[str]: ...
+
+    def is_retryable(self, error: Exception) -> bool: ...
+
+
+class OpenAIProvider:
+    """OpenAI chat completions over a pooled, keep-alive httpx client.
+
+    The SDK's own retries are disabled; `LLMClient` retries under its budget.
+    """
+
+    def __init__(self, api_key: str | None, base_url: str | None = None,
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30, connect_timeout: float = 5,
+                 read_timeout: float = 30):
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            # read is the longest gap allowed between two chunks of a stream
+            timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout,
+                                  write=connect_timeout, pool=connect_timeout),
+        )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url,
+                                  http_client=http_client, max_retries=0)
+
+    async def stream(self, model: str, messages: Messages) -> AsyncGenerator[str, None]:
+        stream = await self.client.chat.completions.create(
+            model=model, messages=messages, stream=True)
+        try:
+            async for event in stream:
+                if event.choices and event.choices[0].delta and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, (openai.APIConnectionError, openai.RateLimitError,
+                                  openai.InternalServerError))
+
+
+class MockProvider:
+    """Local stand-in that streams canned markdown, for tests and offline dev.
+
+    `failures` makes the next N calls raise a retryable ConnectionError
+    before producing anything.
+    """
+
+    DEFAULT_TEXT = (
+        "## Overview\n\nThis is a mock response from the local LLM provider.\n\n"
+        "## Steps\n\n- Review the requirements\n- Implement the change\n- Test it\n"
+    )
+
+    def __init__(self, text: str = DEFAULT_TEXT, chunk_size: int = 8,
+                 first_token_delay: float = 0.0, chunk_delay: float = 0.0,
+                 failures: int = 0):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.failures = failures
+        self.calls = 0
+
+    async def stream(self, model: str, messages: Messages) -> AsyncGenerator[str, None]:
+        self.calls += 1
+        await asyncio.sleep(self.first_token_delay)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("mock provider failure")
+        for start in range(0, len(self.text), self.chunk_size):
+            if start:
+                await asyncio.sleep(self.chunk_delay)
+            yield self.text[start:start + self.chunk_size]
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, ConnectionError)
+
+
+class RetryBudget:
+    """Token bucket that caps retries at a fraction of overall traffic.
+
+    Every call deposits `ratio` tokens (up to `max_tokens`) and every retry
+    spends one, so a failing upstream sees at most ~`ratio` extra load
+    instead of `max_retries` times the load.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class LLMClient:
+    """Wraps a provider with a concurrency cap, timeouts and budgeted retries.
+
+    At most `max_concurrent` upstream calls run at once and up to
+    `queue_limit` more wait for a slot; past that callers get a 503. A call
+    must produce its first chunk within `first_token_timeout` and finish
+    within `total_timeout` seconds. Failures before the first chunk are
+    retried with jittered exponential backoff while the retry budget allows;
+    once text has been yielded the call is never retried.
+    """
+
+    def __init__(self, provider: LLMProvider, model: str, max_concurrent: int,
+                 queue_limit: int, first_token_timeout: float, total_timeout: float,
+                 max_retries: int, retry_budget: RetryBudget,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.provider = provider
+        self.model = model
+        self.max_concurrent = max_concurrent
+        self.queue_limit = queue_limit
+        self.first_token_timeout = first_token_timeout
+        self.total_timeout = total_timeout
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.active = 0
+        self.waiting = 0
+        self.calls = 0
+        self.rejected = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.retries_denied = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        # Created lazily so it binds to the running event loop
+        self._slots: asyncio.Semaphore | None = None
+
+    async def stream(self, messages: Messages, operation: str = "chat") -> AsyncGenerator[str, None]:
+        """`operation` labels this call's metrics, e.g. "suggest"."""
+        if self.waiting >= self.queue_limit and self.active >= self.max_concurrent:
+            self.rejected += 1
+            LLM_CALLS.labels(operation, "rejected").inc()
+            logging.warning("LLM request queue is full, rejecting request")
+            raise ServiceBusyError()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.calls += 1
+        self.retry_budget.deposit()
+
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - queued_at
+        self.queue_wait_seconds += waited
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, waited)
+        LLM_QUEUE_WAIT.observe(waited)
+
+        self.active += 1
+        LLM_REQUESTS_IN_FLIGHT.inc()
+        started = time.monotonic()
+        first_chunk_at = None
+        chunk_count = 0
+        outcome = "cancelled"
+        try:
+            # The deadline starts once we hold a slot; queueing has its own limit
+            deadline = started + self.total_timeout
+            attempt = 0
+            while True:
+                yielded = False
+                try:
+                    async for chunk in self._attempt(messages, deadline):
+                        if not yielded:
+                            yielded = True
+                            first_chunk_at = time.monotonic()
+                            LLM_TIME_TO_FIRST_TOKEN.labels(operation).observe(
+                                first_chunk_at - started)
+                        chunk_count += 1
+                        yield chunk
+                    outcome = "ok"
+                    return
+                except UpstreamTimeoutError:
+                    self.timeouts += 1
+                    if yielded or not self._may_retry(attempt):
+                        self.failures += 1
+                        outcome = "timeout"
+                        raise
+                except Exception as e:
+                    if yielded or not self.provider.is_retryable(e) or not self._may_retry(attempt):
+                        self.failures += 1
+                        outcome = "error"
+                        raise
+                    logging.warning(f"LLM call failed, retrying: {str(e)}")
+                attempt += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                await asyncio.sleep(min(random.uniform(0, delay),
+                                        max(0.0, deadline - time.monotonic())))
+        finally:
+            self.active -= 1
+            self._slots.release()
+            LLM_REQUESTS_IN_FLIGHT.dec()
+            finished = time.monotonic()
+            LLM_CALLS.labels(operation, outcome).inc()
+            LLM_STREAM_DURATION.labels(operation).observe(finished - started)
+            if first_chunk_at is not None and chunk_count > 1 and finished > first_chunk_at:
+                LLM_TOKENS_PER_SECOND.labels(operation).observe(
+                    (chunk_count - 1) / (finished - first_chunk_at))
+
+    async def _attempt(self, messages: Messages, deadline: float) -> AsyncGenerator[str, None]:
+        chunks = aiter(self.provider.stream(self.model, messages))
+        first = True
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                timeout = min(remaining, self.first_token_timeout) if first else remaining
+                if timeout <= 0:
+                    raise UpstreamTimeoutError()
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout)
+                except StopAsyncIteration:
+                    return
+                except (asyncio.TimeoutError, openai.APITimeoutError):
+                    raise UpstreamTimeoutError()
+                first = False
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if not self.retry_budget.try_spend():
+            self.retries_denied += 1
+            return False
+        self.retries += 1
+        return True
+
+    async def complete(self, messages: Messages, operation: str = "chat") -> str:
+        return "".join([chunk async for chunk in self.stream(messages, operation)])
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "queue_limit": self.queue_limit,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "retry_budget_tokens": self.retry_budget.tokens,
+            "avg_queue_wait_seconds": self.queue_wait_seconds / self.calls if self.calls else 0.0,
+            "max_queue_wait_seconds": self.max_queue_wait_seconds,
+        }
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
 
 class SuggestRequest(BaseModel):
@@ -15,3 +16,14 @@ class DailyPlanResponse(BaseModel):
     user_id: UUID
     date: date
     plan: str
+
+
+class DailyPlanHistoryRow(TypedDict):
+    user_id: UUID
+    date: date
+    plan: str
+    created_at: datetime
+    updated_at: datetime
+
+
+daily_plan_history_adapter = TypeAdapter(list[DailyPlanHistoryRow])
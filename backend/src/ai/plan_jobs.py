@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import AsyncIterator, Callable
+from uuid import UUID
+
+from src.exceptions import ServiceBusyError
+
+from .broadcast import StreamBroadcast
+
+
+class DailyPlanJobManager:
+    """Runs at most one daily plan generation per user at a time.
+
+    Starting a generation while one is already running for that user
+    returns the running job, so a double-click or a second tab follows the
+    same stream instead of triggering another one. Jobs run on a bounded
+    pool of `max_workers` slots; up to `queue_limit` more may wait for a
+    slot and anything past that is rejected with a 503.
+
+    Finished jobs that produced output are kept for `retention_seconds` so
+    a client that lost its connection near the end can still resume from
+    the buffer.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int, retention_seconds: float = 300):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[UUID, StreamBroadcast] = {}
+        self._finished: dict[UUID, tuple[StreamBroadcast, float]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._slots: asyncio.Semaphore | None = None
+
+    def get(self, user_id: UUID) -> StreamBroadcast | None:
+        """The user's running job, or the most recent finished one if it is
+        still within the retention window."""
+        job = self._jobs.get(user_id)
+        if job is not None:
+            return job
+        finished = self._finished.get(user_id)
+        if finished is None:
+            return None
+        job, expires_at = finished
+        if expires_at <= time.monotonic():
+            del self._finished[user_id]
+            return None
+        return job
+
+    def start(self, user_id: UUID,
+              produce: Callable[[], AsyncIterator[str]]) -> StreamBroadcast:
+        job = self._jobs.get(user_id)
+        if job is not None:
+            return job
+        if len(self._jobs) >= self.max_workers + self.queue_limit:
+            logging.warning("Daily plan job queue is full, rejecting request")
+            raise ServiceBusyError()
+        # Created lazily so it binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        job = StreamBroadcast()
+        self._jobs[user_id] = job
+        # A fresh context: the job outlives the request that started it and
+        # must not record its queries into that request's query log
+        task = asyncio.create_task(self._run(user_id, job, produce),
+                                   context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, user_id: UUID, job: StreamBroadcast,
+                   produce: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async with self._slots:
+                async for chunk in produce():
+                    await job.publish(chunk)
+            await job.finish()
+        except asyncio.CancelledError:
+            # e.g. on shutdown; readers would otherwise wait for it forever
+            await job.finish(ServiceBusyError("Daily plan generation was cancelled"))
+            raise
+        except Exception as e:
+            logging.error(
+                f"Daily plan generation failed for user {user_id}: {str(e)}")
+            await job.finish(e)
+        finally:
+            self._jobs.pop(user_id, None)
+            self._prune_finished()
+            # A job that failed before producing anything has nothing to
+            # resume; reconnects fall back to the saved plan instead
+            if job.chunks or job.error is None:
+                self._finished[user_id] = (
+                    job, time.monotonic() + self.retention_seconds)
+            else:
+                self._finished.pop(user_id, None)
+
+    def _prune_finished(self) -> None:
+        now = time.monotonic()
+        for user_id in [u for u, (_, expires_at) in self._finished.items() if expires_at <= now]:
+            del self._finished[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._jobs),
+            "retained": len(self._finished),
+            "max_workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+        }
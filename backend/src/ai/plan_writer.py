@@ -0,0 +1,63 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import anyio
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entities.daily_plan import DailyPlan
+
+load_dotenv()
+
+PLAN_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("PLAN_FLUSH_INTERVAL_SECONDS", "1.0"))
+PLAN_FLUSH_BYTES = int(os.getenv("PLAN_FLUSH_BYTES", "2048"))
+
+
+class DailyPlanWriter:
+    """Accumulates a streamed plan and persists it in coalesced writes.
+
+    The partial plan is written once `flush_interval` seconds have passed or
+    `flush_bytes` of new text has built up since the last write, whichever
+    comes first, instead of once per streamed token.
+    """
+
+    def __init__(self, db: AsyncSession, plan: DailyPlan,
+                 flush_interval: float = PLAN_FLUSH_INTERVAL_SECONDS,
+                 flush_bytes: int = PLAN_FLUSH_BYTES):
+        self.db = db
+        self.plan = plan
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.flush_count = 0
+        self._parts: list[str] = []
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    async def append(self, chunk: str) -> None:
+        self._parts.append(chunk)
+        self._pending_bytes += len(chunk.encode("utf-8"))
+        if (self._pending_bytes >= self.flush_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending_bytes:
+            return
+        self.plan.plan = self.text
+        self.plan.updated_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        self.flush_count += 1
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    async def close(self) -> None:
+        """Write whatever is still buffered, even if the stream was cancelled
+        by a client disconnect."""
+        with anyio.CancelScope(shield=True):
+            await self.flush()
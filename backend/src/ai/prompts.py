@@ -0,0 +1,133 @@
+import logging
+import math
+import os
+from datetime import date
+
+from dotenv import load_dotenv
+
+from src.entities.task import Status
+
+from .scheduler import WORKDAY_MINUTES
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on daily plan prompt size; lower-priority tasks are summarized
+# in one line once it is reached
+PLAN_PROMPT_TOKEN_BUDGET = int(os.getenv("PLAN_PROMPT_TOKEN_BUDGET", "3000"))
+PLAN_DESCRIPTION_MAX_TOKENS = int(os.getenv("PLAN_DESCRIPTION_MAX_TOKENS", "80"))
+
+MARKDOWN_INSTRUCTIONS = (
+    "Return the plan as a detailed markdown document with sections, headings, "
+    "bullet points, and actionable steps. Only return the markdown, no other text."
+)
+
+
+class TokenCounter:
+    """Counts tokens with the model's tiktoken encoding.
+
+    tiktoken downloads its encoding files on first use (cached under
+    TIKTOKEN_CACHE_DIR). If they can't be loaded, counts fall back to a
+    conservative estimate of one token per three UTF-8 bytes.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = None
+        self._loaded = False
+
+    @property
+    def encoding(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                import tiktoken
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning("tiktoken unavailable, estimating token counts: %s", e)
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return math.ceil(len(text.encode("utf-8")) / 3)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            cut = self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        else:
+            cut = text.encode("utf-8")[:max_tokens * 3].decode("utf-8", "ignore")
+        return cut.rstrip() + "..."
+
+
+def task_priority(task) -> tuple:
+    """In Progress before Todo, then oldest first."""
+    return (task.status != Status.InProgress, task.created_at)
+
+
+def _task_line(task, title: str, description: str) -> str:
+    return (f"- {title}: {description} "
+            f"(Estimated: {task.total_minutes or 'unspecified'} min, Status: {task.status.value})")
+
+
+def build_daily_plan_prompt(tasks, today: date, counter: TokenCounter,
+                            budget: int = PLAN_PROMPT_TOKEN_BUDGET,
+                            description_max_tokens: int = PLAN_DESCRIPTION_MAX_TOKENS) -> str:
+    """Daily plan prompt for the user's Todo/In Progress tasks.
+
+    Tasks are listed in priority order with titles and descriptions cut to
+    `description_max_tokens`, until the prompt would exceed `budget` tokens;
+    the rest are summarized by count and total estimate.
+    """
+    if not tasks:
+        return (
+            f"Today is {today}. I have no tasks in Todo or In Progress status. "
+            f"Suggest that I should meet with my team to discuss and come up with new tasks, "
+            f"or suggest other productive activities I could focus on today. "
+            f"{MARKDOWN_INSTRUCTIONS}"
+        )
+
+    header = f"Today is {today}. Here are my tasks for today (only Todo and In Progress), highest priority first:\n"
+    footer = (
+        f"\n\nThe working day is {WORKDAY_MINUTES} minutes long. Suggest a detailed, actionable daily plan that fits within this time. "
+        f"Prioritize Todo and In Progress tasks, and if there is not enough time, suggest which tasks to defer. "
+        f"For each task included, mention the estimated time allocation. "
+        f"{MARKDOWN_INSTRUCTIONS}"
+    )
+    # Room for the summary line of omitted tasks
+    remaining = budget - counter.count(header) - counter.count(footer) - 40
+
+    lines = []
+    ordered = sorted(tasks, key=task_priority)
+    for task in ordered:
+        line = _task_line(task, counter.truncate(task.title, description_max_tokens),
+                          counter.truncate(task.description, description_max_tokens))
+        cost = counter.count(line) + 1
+        if cost > remaining:
+            break
+        lines.append(line)
+        remaining -= cost
+
+    omitted = ordered[len(lines):]
+    if omitted:
+        minutes = sum(task.total_minutes or 0 for task in omitted)
+        lines.append(f"- ...and {len(omitted)} more lower-priority tasks not listed "
+                     f"(about {minutes} min estimated in total).")
+    return header + "\n".join(lines) + footer
+
+
+def build_polish_prompt(schedule_markdown: str) -> str:
+    """Asks the LLM to reword a locally computed schedule without changing it."""
+    return (
+        f"Here is my schedule for today:\n\n{schedule_markdown}\n"
+        f"Rewrite it as a friendly, motivating daily plan. Keep every time slot, task, "
+        f"break and deferred task exactly as given; only improve the wording and add "
+        f"short actionable tips under each task. "
+        f"{MARKDOWN_INSTRUCTIONS}"
+    )
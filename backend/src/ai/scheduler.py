@@ -0,0 +1,168 @@
+"""Deterministic local day scheduler.
+
+Fits the user's Todo/In Progress task estimates into a work day without an
+LLM round trip: In Progress tasks are placed first in age order, then the
+Todo tasks that fill the remaining time best (a 0/1 knapsack on minutes,
+ties going to older tasks). Work is laid out on a clock with a short break
+after every `break_every_minutes` of work, and everything that didn't fit is
+listed as deferred.
+"""
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+from src.entities.task import Status
+
+load_dotenv()
+
+WORKDAY_MINUTES = int(os.getenv("WORKDAY_MINUTES", "480"))
+WORKDAY_START = os.getenv("WORKDAY_START", "09:00")
+BREAK_EVERY_MINUTES = int(os.getenv("BREAK_EVERY_MINUTES", "120"))
+BREAK_MINUTES = int(os.getenv("BREAK_MINUTES", "15"))
+# Used for tasks without an estimate
+DEFAULT_TASK_MINUTES = int(os.getenv("DEFAULT_TASK_MINUTES", "30"))
+
+
+@dataclass
+class ScheduleBlock:
+    start: datetime
+    minutes: int
+    task: object | None = None  # None for a break
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(minutes=self.minutes)
+
+
+@dataclass
+class DaySchedule:
+    day: date
+    capacity_minutes: int
+    blocks: list[ScheduleBlock] = field(default_factory=list)
+    scheduled: list = field(default_factory=list)
+    deferred: list = field(default_factory=list)
+
+    @property
+    def scheduled_minutes(self) -> int:
+        return sum(task_minutes(task) for task in self.scheduled)
+
+
+def task_minutes(task) -> int:
+    if task.total_minutes is None:
+        return DEFAULT_TASK_MINUTES
+    # Rows saved before estimates were validated may be negative
+    return max(0, task.total_minutes)
+
+
+def work_capacity(workday_minutes: int, break_every: int, break_minutes: int) -> int:
+    """Most work minutes that fit in the day once the breaks they require
+    are counted."""
+    if break_every <= 0 or break_minutes <= 0:
+        return workday_minutes
+    work = workday_minutes
+    while work > 0 and work + (math.ceil(work / break_every) - 1) * break_minutes > workday_minutes:
+        work -= 1
+    return work
+
+
+def _knapsack(weights: list[int], values: list[int], capacity: int) -> set[int]:
+    """Indexes of the items with the highest total value within capacity."""
+    best = [0] * (capacity + 1)
+    taken = []
+    for weight, value in zip(weights, values):
+        take = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                take[c] = 1
+        taken.append(take)
+    chosen = set()
+    c = capacity
+    for i in range(len(weights) - 1, -1, -1):
+        if taken[i][c]:
+            chosen.add(i)
+            c -= weights[i]
+    return chosen
+
+
+def schedule_day(tasks, day: date, workday_minutes: int = WORKDAY_MINUTES,
+                 start: str = WORKDAY_START, break_every: int = BREAK_EVERY_MINUTES,
+                 break_minutes: int = BREAK_MINUTES) -> DaySchedule:
+    capacity = work_capacity(workday_minutes, break_every, break_minutes)
+    schedule = DaySchedule(day=day, capacity_minutes=capacity)
+
+    by_age = sorted(tasks, key=lambda t: (t.created_at, str(t.id)))
+    remaining = capacity
+    for task in (t for t in by_age if t.status == Status.InProgress):
+        if task_minutes(task) <= remaining:
+            schedule.scheduled.append(task)
+            remaining -= task_minutes(task)
+        else:
+            schedule.deferred.append(task)
+
+    todo = [t for t in by_age if t.status != Status.InProgress]
+    fits = [t for t in todo if task_minutes(t) <= remaining]
+    # Fill as many minutes as possible; among equal fills prefer older tasks.
+    # The age bonus sums to less than one minute's worth of value.
+    scale = len(fits) * len(fits) + 1
+    chosen = _knapsack([task_minutes(t) for t in fits],
+                       [task_minutes(t) * scale + (len(fits) - i) for i, t in enumerate(fits)],
+                       remaining)
+    chosen_tasks = {id(fits[i]) for i in chosen}
+    for task in todo:
+        if id(task) in chosen_tasks:
+            schedule.scheduled.append(task)
+        else:
+            schedule.deferred.append(task)
+
+    clock = datetime.combine(day, datetime.strptime(start, "%H:%M").time())
+    since_break = 0
+    for task in schedule.scheduled:
+        left = task_minutes(task)
+        if left == 0:
+            schedule.blocks.append(ScheduleBlock(clock, 0, task))
+        while left > 0:
+            if break_every > 0 and break_minutes > 0 and since_break >= break_every:
+                schedule.blocks.append(ScheduleBlock(clock, break_minutes))
+                clock += timedelta(minutes=break_minutes)
+                since_break = 0
+            # Long tasks are split around breaks
+            span = min(left, break_every - since_break) if break_every > 0 else left
+            schedule.blocks.append(ScheduleBlock(clock, span, task))
+            clock += timedelta(minutes=span)
+            since_break += span
+            left -= span
+    return schedule
+
+
+def render_schedule(schedule: DaySchedule) -> str:
+    lines = [f"# Daily Plan for {schedule.day.isoformat()}", "", "## Schedule", ""]
+    if not schedule.blocks:
+        lines.append("- No Todo or In Progress tasks fit today. Meet with your team to "
+                     "pick up new work or plan upcoming tasks.")
+    for block in schedule.blocks:
+        slot = f"**{block.start:%H:%M}–{block.end:%H:%M}**"
+        if block.task is None:
+            lines.append(f"- {slot} Break")
+        else:
+            lines.append(f"- {slot} {block.task.title} *({block.task.status.value}, {block.minutes} min)*")
+
+    if schedule.deferred:
+        lines += ["", "## Deferred", ""]
+        for task in schedule.deferred:
+            estimate = (f"{task.total_minutes} min" if task.total_minutes is not None
+                        else "no estimate")
+            lines.append(f"- {task.title} ({estimate}, {task.status.value})")
+
+    deferred_minutes = sum(task_minutes(task) for task in schedule.deferred)
+    lines += [
+        "", "## Summary", "",
+        f"- Scheduled {len(schedule.scheduled)} tasks: {schedule.scheduled_minutes} of "
+        f"{schedule.capacity_minutes} available work minutes.",
+        f"- Deferred {len(schedule.deferred)} tasks ({deferred_minutes} min).",
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,144 +1,257 @@
 from dotenv import load_dotenv
 from typing import AsyncGenerator
 from .models import SuggestRequest
+from .plan_writer import DailyPlanWriter
+from .suggest_cache import SuggestionCache
+from .plan_jobs import DailyPlanJobManager
+from .broadcast import StreamBroadcast
+from .llm import LLMClient, MockProvider, OpenAIProvider, RetryBudget
+from .prompts import TokenCounter, build_daily_plan_prompt, build_polish_prompt
+from .scheduler import render_schedule, schedule_day
+import asyncio
+import hashlib
+import json
 import os
-from openai import AsyncOpenAI
-from datetime import date
+from datetime import date, datetime, timezone
 from src.auth.service import CurrentUser
+from src.database.core import AsyncSessionLocal
 from src.entities.daily_plan import DailyPlan
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date as dt_date
-from sqlalchemy import desc
-
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_KEY"))
+from sqlalchemy import delete, desc, func, select
+from src.etags import make_etag
+from src.exceptions import EmptyUpstreamResponseError
 
 load_dotenv()
 
 
+def _build_provider():
+    if os.getenv("LLM_PROVIDER", "openai") == "mock":
+        return MockProvider()
+    return OpenAIProvider(
+        api_key=os.getenv("OPENAI_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5")),
+        read_timeout=float(os.getenv("LLM_READ_TIMEOUT_SECONDS", "30")),
+    )
+
+
+llm = LLMClient(
+    provider=_build_provider(),
+    model=os.getenv("LLM_MODEL", "gpt-3.5-turbo"),
+    max_concurrent=int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "16")),
+    queue_limit=int(os.getenv("LLM_QUEUE_LIMIT", "64")),
+    first_token_timeout=float(os.getenv("LLM_FIRST_TOKEN_TIMEOUT_SECONDS", "15")),
+    total_timeout=float(os.getenv("LLM_TOTAL_TIMEOUT_SECONDS", "120")),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+    retry_budget=RetryBudget(
+        ratio=float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.1")),
+        max_tokens=float(os.getenv("LLM_RETRY_BUDGET_MAX", "10")),
+    ),
+)
+
+token_counter = TokenCounter(llm.model)
+
+suggest_cache = SuggestionCache(
+    ttl_seconds=float(os.getenv("SUGGEST_CACHE_TTL_SECONDS", "86400")),
+    max_entries=int(os.getenv("SUGGEST_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("SUGGEST_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+)
+
+daily_plan_jobs = DailyPlanJobManager(
+    max_workers=int(os.getenv("DAILY_PLAN_MAX_CONCURRENT_JOBS", "4")),
+    queue_limit=int(os.getenv("DAILY_PLAN_JOB_QUEUE_LIMIT", "32")),
+    retention_seconds=float(os.getenv("DAILY_PLAN_JOB_RETENTION_SECONDS", "300")),
+)
+
+
 async def ai_suggest_stream(request: SuggestRequest, current_user: CurrentUser) -> AsyncGenerator[str, None]:
+    async for chunk in suggest_cache.stream(request.title, lambda: _suggest_upstream_stream(request.title)):
+        yield chunk
+
+
+async def _suggest_upstream_stream(title: str) -> AsyncGenerator[str, None]:
     prompt = (
-        f"Draft a detailed task description for the following title: '{request.title}'. "
+        f"Draft a detailed task description for the following title: '{title}'. "
         f"Return the description as a well-formatted markdown document. "
         f"Ensure there is a blank line between headings, paragraphs, and lists. "
         f"Use markdown features such as headings, lists, and bold where appropriate. Only return the markdown, no other text."
     )
-    stream = await client.chat.completions.create(model="gpt-3.5-turbo",
-                                                  messages=[
-                                                      {"role": "user", "content": prompt}],
-                                                  stream=True)
-
-    async for event in stream:
-        # Only yield the content string
-        if event.choices and event.choices[0].delta and event.choices[0].delta.content:
-            chunk = event.choices[0].delta.content or ""
-            yield chunk
+    async for chunk in llm.stream([{"role": "user", "content": prompt}], "suggest"):
+        yield chunk
 
 
 async def generate_daily_plan_for_user(user_id, tasks, db=None, daily_plan_id=None):
-    today = date.today().isoformat()
-    if not tasks:
-        prompt = (
-            f"Today is {today}. I have no tasks in Todo or In Progress status. "
-            f"Suggest that I should meet with my team to discuss and come up with new tasks, "
-            f"or suggest other productive activities I could focus on today. "
-            f"Return the plan as a detailed markdown document with sections, headings, bullet points, and actionable steps. Only return the markdown, no other text."
-        )
-    else:
-        task_list = '\n'.join(
-            f"- {t.title}: {t.description} (Estimated: {t.total_minutes or 'unspecified'} min, Status: {t.status.value})"
-            for t in tasks
-        )
-        prompt = (
-            f"Today is {today}. Here are my tasks for today (only Todo and In Progress):\n"
-            f"{task_list}\n\n"
-            f"The working day is 8 hours (480 minutes). Suggest a detailed, actionable daily plan that fits within this time. "
-            f"Prioritize Todo and In Progress tasks, and if there is not enough time, suggest which tasks to defer. "
-            f"For each task included, mention the estimated time allocation. "
-            f"Return the plan as a detailed markdown document with sections, headings, bullet points, and actionable steps. Only return the markdown, no other text."
-        )
-
-    completion = await client.chat.completions.create(model="gpt-3.5-turbo",
-                                                      messages=[{"role": "user", "content": prompt}])
-    plan_text = completion.choices[0].message.content
+    prompt = await asyncio.to_thread(build_daily_plan_prompt, tasks, date.today(), token_counter)
+    plan_text = await llm.complete([{"role": "user", "content": prompt}], "daily_plan")
 
     # If daily_plan_id and db are provided, update the correct record
     if daily_plan_id and db:
-        plan = db.query(DailyPlan).filter(
-            DailyPlan.id == daily_plan_id).first()
+        plan = await db.get(DailyPlan, daily_plan_id)
         if plan:
             plan.plan = plan_text
-            plan.updated_at = date.today()
-            db.commit()
+            plan.updated_at = datetime.now(timezone.utc)
+            await db.commit()
             return plan_text
 
     return plan_text
 
 
-async def get_daily_plan_for_user(user_id, db: Session) -> DailyPlan | None:
-    return db.query(DailyPlan).filter(
+async def get_daily_plan_for_user(user_id, db: AsyncSession) -> DailyPlan | None:
+    result = await db.execute(select(DailyPlan).where(
+        DailyPlan.user_id == user_id
+    ).order_by(DailyPlan.created_at.desc()).limit(1))
+    return result.scalars().first()
+
+
+async def get_daily_plan_etag(user_id, db: AsyncSession) -> str | None:
+    """ETag of the user's latest plan, read without loading the plan text."""
+    row = (await db.execute(select(DailyPlan.id, DailyPlan.updated_at).where(
         DailyPlan.user_id == user_id
-    ).order_by(DailyPlan.created_at.desc()).first()
+    ).order_by(DailyPlan.created_at.desc()).limit(1))).first()
+    if row is None:
+        return None
+    return make_etag(row.id, row.updated_at)
+
+
+async def get_daily_plan_history_etag(user_id, db: AsyncSession) -> str:
+    count, last_updated = (await db.execute(
+        select(func.count(DailyPlan.id), func.max(DailyPlan.updated_at)).where(
+            DailyPlan.user_id == user_id))).one()
+    return make_etag(user_id, count, last_updated)
+
+
+def plan_fingerprint(tasks, today: date, mode: str = "llm") -> str:
+    """Fingerprint of everything the daily plan is built from."""
+    inputs = sorted(
+        (str(t.id), t.title, t.description, t.total_minutes, t.status.value)
+        for t in tasks
+    )
+    payload = json.dumps([today.isoformat(), mode, inputs], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-async def stream_generate_and_save_daily_plan(current_user: CurrentUser, db: Session):
+async def _plan_tasks(user_id, db: AsyncSession):
+    """The Todo/In Progress tasks a daily plan is built from."""
     from src.entities.task import Task, Status
-    user_id = current_user.get_uuid()
-    today = date.today()
-    # Remove all existing plans for today for this user
-    from src.entities.daily_plan import DailyPlan
-    db.query(DailyPlan).filter(DailyPlan.user_id ==
-                               user_id, DailyPlan.date == today).delete()
-    db.commit()
-    tasks = db.query(Task).filter(
+    result = await db.execute(select(Task).where(
         Task.user_id == user_id,
         Task.status.in_([Status.Todo, Status.InProgress])
-    ).all()
-    if not tasks:
-        prompt = (
-            f"Today is {today}. I have no tasks in Todo or In Progress status. "
-            f"Suggest that I should meet with my team to discuss and come up with new tasks, "
-            f"or suggest other productive activities I could focus on today. "
-            f"Return the plan as a detailed markdown document with sections, headings, bullet points, and actionable steps. Only return the markdown, no other text."
-        )
+    ))
+    return result.scalars().all()
+
+
+async def is_daily_plan_current(user_id, db: AsyncSession, mode: str = "llm") -> bool:
+    """Whether today's saved plan is complete and built from the user's
+    current tasks in this mode, i.e. generating would only replay it."""
+    tasks = await _plan_tasks(user_id, db)
+    plan = await get_todays_daily_plan(user_id, db)
+    return plan is not None and plan.input_fingerprint == plan_fingerprint(tasks, date.today(), mode)
+
+
+async def _single_chunk(text: str) -> AsyncGenerator[str, None]:
+    yield text
+
+
+async def stream_generate_and_save_daily_plan(current_user: CurrentUser, db: AsyncSession,
+                                              force: bool = False, mode: str = "llm"):
+    """Streams today's plan. If a complete plan already exists for the same
+    tasks and mode it is replayed instead of regenerated, unless `force` is set.
+
+    `mode` is "llm" (the model writes the plan), "local" (the local scheduler
+    alone, no upstream call) or "polished" (the local schedule, reworded by
+    the model).
+    """
+    user_id = current_user.get_uuid()
+    today = date.today()
+    tasks = await _plan_tasks(user_id, db)
+    fingerprint = plan_fingerprint(tasks, today, mode)
+    if not force:
+        existing = await get_todays_daily_plan(user_id, db)
+        if existing is not None and existing.input_fingerprint == fingerprint:
+            yield existing.plan
+            return
+    if mode == "llm":
+        # Tokenizing (and loading the encoding on first use) is blocking work
+        prompt = await asyncio.to_thread(build_daily_plan_prompt, tasks, today, token_counter)
+        chunks = llm.stream([{"role": "user", "content": prompt}], "daily_plan")
     else:
-        task_list = '\n'.join(
-            f"- {t.title}: {t.description} (Estimated: {t.total_minutes or 'unspecified'} min, Status: {t.status.value})"
-            for t in tasks
-        )
-        prompt = (
-            f"Today is {today}. Here are my tasks for today (only Todo and In Progress):\n"
-            f"{task_list}\n\n"
-            f"The working day is 8 hours (480 minutes). Suggest a detailed, actionable daily plan that fits within this time. "
-            f"Prioritize Todo and In Progress tasks, and if there is not enough time, suggest which tasks to defer. "
-            f"For each task included, mention the estimated time allocation. "
-            f"Return the plan as a detailed markdown document with sections, headings, bullet points, and actionable steps. Only return the markdown, no other text."
-        )
-    stream = await client.chat.completions.create(model="gpt-3.5-turbo",
-                                                  messages=[
-                                                      {"role": "user", "content": prompt}],
-                                                  stream=True)
-    plan_text = ""
-    # Create a new DailyPlan record with placeholder text
+        schedule = render_schedule(schedule_day(tasks, today))
+        if mode == "polished":
+            chunks = llm.stream([{"role": "user", "content": build_polish_prompt(schedule)}],
+                                "daily_plan_polish")
+        else:
+            chunks = _single_chunk(schedule)
+    # End the read transaction so no connection is held while waiting
+    await db.commit()
+    # Wait for the first chunk before replacing today's plan, so a rejected
+    # or failed upstream call leaves the previous plan in place
+    first_chunk = await anext(chunks, None)
+    if first_chunk is None:
+        # Nothing to replace it with; an empty plan would also count as
+        # current and be replayed from then on
+        raise EmptyUpstreamResponseError()
+    # Replace today's plans with a new one (placeholder text) in one transaction
     from datetime import datetime, timezone
-    plan = DailyPlan(user_id=user_id, date=date.today(), plan="", created_at=datetime.now(
+    await db.execute(delete(DailyPlan).where(DailyPlan.user_id ==
+                                             user_id, DailyPlan.date == today))
+    plan = DailyPlan(user_id=user_id, date=today, plan="", created_at=datetime.now(
         timezone.utc), updated_at=datetime.now(timezone.utc))
     db.add(plan)
-    db.commit()
-    db.refresh(plan)
-    async for event in stream:
-        if event.choices and event.choices[0].delta and event.choices[0].delta.content:
-            chunk = event.choices[0].delta.content
-            plan_text += chunk
-            plan.plan = plan_text
-            plan.updated_at = datetime.now(timezone.utc)
-            db.commit()
+    await db.commit()
+    await db.refresh(plan)
+    writer = DailyPlanWriter(db, plan)
+    try:
+        await writer.append(first_chunk)
+        yield first_chunk
+        async for chunk in chunks:
+            await writer.append(chunk)
             yield chunk
-    # Final save
-    plan.plan = plan_text
-    plan.updated_at = datetime.now(timezone.utc)
-    db.commit()
+        # Only a complete plan may stand in for a later regeneration
+        plan.input_fingerprint = fingerprint
+        await writer.flush()
+        await db.commit()
+    finally:
+        await chunks.aclose()
+        # Final save, also reached when the client disconnects mid-stream
+        await writer.close()
+
+
+def start_daily_plan_job(current_user: CurrentUser, force: bool = False,
+                         mode: str = "llm") -> StreamBroadcast:
+    """Start (or join) the user's daily plan generation in the background."""
+    async def produce():
+        # The job outlives the request, so it owns its session
+        async with AsyncSessionLocal() as db:
+            async for chunk in stream_generate_and_save_daily_plan(current_user, db, force, mode):
+                yield chunk
+    return daily_plan_jobs.start(current_user.get_uuid(), produce)
+
 
+def get_daily_plan_job(current_user: CurrentUser) -> StreamBroadcast | None:
+    return daily_plan_jobs.get(current_user.get_uuid())
 
-def get_all_daily_plans_for_user(user_id, db: Session):
+
+async def get_todays_daily_plan(user_id, db: AsyncSession) -> DailyPlan | None:
+    result = await db.execute(select(DailyPlan).where(
+        DailyPlan.user_id == user_id, DailyPlan.date == date.today()
+    ).order_by(DailyPlan.created_at.desc()).limit(1))
+    return result.scalars().first()
+
+
+async def get_all_daily_plans_for_user(user_id, db: AsyncSession):
     from src.entities.daily_plan import DailyPlan
-    return db.query(DailyPlan).filter(DailyPlan.user_id == user_id).order_by(desc(DailyPlan.date)).all()
+    result = await db.execute(select(DailyPlan).where(
+        DailyPlan.user_id == user_id).order_by(desc(DailyPlan.date)))
+    return result.scalars().all()
+
+
+async def get_daily_plan_history_rows(user_id, db: AsyncSession) -> list[dict]:
+    """Column-level variant of get_all_daily_plans_for_user for the fast path."""
+    result = await db.execute(select(
+        DailyPlan.user_id, DailyPlan.date, DailyPlan.plan,
+        DailyPlan.created_at, DailyPlan.updated_at
+    ).where(DailyPlan.user_id == user_id).order_by(desc(DailyPlan.date)))
+    return [dict(row) for row in result.mappings()]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import re
+from typing import AsyncGenerator, AsyncIterator, Iterator
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+load_dotenv()
+
+SSE_COALESCE_INTERVAL_MS = int(os.getenv("SSE_COALESCE_INTERVAL_MS", "50"))
+SSE_COALESCE_MAX_BYTES = int(os.getenv("SSE_COALESCE_MAX_BYTES", "512"))
+SSE_REPLAY_CHUNK_CHARS = 1024
+
+# The line terminators an SSE parser splits on
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def sse_event(data: str, event_id: int | str | None = None) -> str:
+    """One SSE frame. Each line of `data` gets its own `data:` field, which
+    clients join back together with "\n" (so "\r\n" arrives as "\n")."""
+    lines = "".join(f"data: {line}\n" for line in _LINE_BREAK.split(data))
+    if event_id is None:
+        return f"{lines}\n"
+    return f"id: {event_id}\n{lines}\n"
+
+
+def sse_text_events(text: str, position: int = 0,
+                    chunk_chars: int = SSE_REPLAY_CHUNK_CHARS) -> Iterator[str]:
+    """Frames `text[position:]` as events of up to `chunk_chars` characters,
+    each with the offset of its end as id. A client cut off mid-replay only
+    keeps the ids of events it fully received, so it resumes from there."""
+    while position < len(text):
+        end = min(position + chunk_chars, len(text))
+        # Don't split a \r\n, which would reach the client as two line breaks
+        if text[end - 1] == "\r" and text[end:end + 1] == "\n":
+            end += 1
+        yield sse_event(text[position:end], end)
+        position = end
+
+
+def sse_error_event(error: Exception) -> str:
+    """Final `error` event for a stream that fails after its 200 response
+    has started, e.g. an upstream timeout mid-generation."""
+    if isinstance(error, HTTPException):
+        status_code, detail = error.status_code, error.detail
+    else:
+        status_code, detail = 502, "AI generation failed"
+    return "event: error\n" + sse_event(json.dumps({"status": status_code, "detail": detail}))
+
+
+async def started(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """`chunks`, once its first chunk has arrived.
+
+    Await this before returning a StreamingResponse: an upstream call that
+    is rejected (503) or times out before producing anything (504) then
+    fails the request with its own status, rather than ending a stream
+    that already went out as 200.
+    """
+    iterator = aiter(chunks)
+    try:
+        first = await anext(iterator)
+    except StopAsyncIteration:
+        return iterator
+
+    async def resumed() -> AsyncGenerator[str, None]:
+        try:
+            yield first
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+    return resumed()
+
+
+def json_data(text: str) -> str:
+    """Text as a JSON string literal: newline-free and UTF-8, without the
+    ~33% overhead of base64."""
+    return json.dumps(text, ensure_ascii=False)
+
+
+async def coalesce(chunks: AsyncIterator[str],
+                   interval_ms: int = SSE_COALESCE_INTERVAL_MS,
+                   max_bytes: int = SSE_COALESCE_MAX_BYTES) -> AsyncGenerator[str, None]:
+    """Batch small stream chunks: emit whatever has been buffered once
+    `interval_ms` has passed since its first chunk arrived, or as soon as it
+    reaches `max_bytes`, so the client gets a few larger frames instead of
+    one per token."""
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: list[str] = []
+    size = 0
+    deadline = 0.0
+    pending = asyncio.ensure_future(anext(iterator))
+    try:
+        while True:
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield "".join(buffer)
+                buffer, size = [], 0
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                break
+            if not buffer:
+                deadline = loop.time() + interval_ms / 1000
+            buffer.append(chunk)
+            size += len(chunk.encode("utf-8"))
+            if size >= max_bytes:
+                yield "".join(buffer)
+                buffer, size = [], 0
+            pending = asyncio.ensure_future(anext(iterator))
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        # Release the upstream stream now rather than at garbage collection
+        if not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, AsyncIterator, Callable
+
+from src.exceptions import ServiceBusyError
+
+from .broadcast import StreamBroadcast
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """Cache key for a task title: case, surrounding punctuation and runs of
+    whitespace don't change the suggestion we'd get back."""
+    return _WHITESPACE.sub(" ", title).strip().strip(".!?:;,").strip().casefold()
+
+
+class SuggestionCache:
+    """TTL + LRU cache of generated descriptions with single-flight upstream
+    calls: concurrent requests for the same normalized title share one
+    upstream stream instead of each starting their own."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._bytes = 0
+        self._in_flight: dict[str, StreamBroadcast] = {}
+        # Keeps producer tasks referenced until they finish
+        self._tasks: set[asyncio.Task] = set()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        text, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = (text, time.monotonic() + self.ttl_seconds)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str) -> None:
+        text, _ = self._entries.pop(key)
+        self._bytes -= len(text.encode("utf-8"))
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "hit_rate": (self.hits + self.coalesced) / requests if requests else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "in_flight": len(self._in_flight),
+        }
+
+    async def stream(self, title: str,
+                     produce: Callable[[], AsyncIterator[str]]) -> AsyncGenerator[str, None]:
+        key = normalize_title(title)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            yield cached
+            return
+
+        broadcast = self._in_flight.get(key)
+        if broadcast is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            self.upstream_calls += 1
+            broadcast = StreamBroadcast()
+            self._in_flight[key] = broadcast
+            # The upstream stream runs in its own task so it completes (and
+            # fills the cache) even if the client that started it goes away.
+            # A fresh context keeps it out of the starting request's query log
+            task = asyncio.create_task(self._produce(key, broadcast, produce),
+                                       context=contextvars.Context())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        async for chunk in broadcast.subscribe():
+            yield chunk
+
+    async def _produce(self, key: str, broadcast: StreamBroadcast,
+                       produce: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async for chunk in produce():
+                await broadcast.publish(chunk)
+            self.put(key, broadcast.text)
+            await broadcast.finish()
+        except asyncio.CancelledError:
+            # e.g. on shutdown; subscribers would otherwise wait for it forever
+            await broadcast.finish(ServiceBusyError("Suggestion generation was cancelled"))
+            raise
+        except Exception as e:
+            logging.error(f"Suggestion stream failed for '{key}': {str(e)}")
+            await broadcast.finish(e)
+        finally:
+            self._in_flight.pop(key, None)
@@ -4,6 +4,7 @@ from src.auth.controller import router as auth_router
 from src.users.controller import router as user_router
 from src.tasks.controller import router as task_router
 from src.ai.controller import router as ai_router
+from src.metrics import router as metrics_router
 
 
 def register_routes(app: FastAPI):
@@ -11,3 +12,4 @@ def register_routes(app: FastAPI):
     app.include_router(user_router)
     app.include_router(task_router)
     app.include_router(ai_router)
+    app.include_router(metrics_router)
@@ -4,7 +4,7 @@ from starlette import status
 from . import models
 from . import service
 from fastapi.security import OAuth2PasswordRequestForm
-from ..database.core import DbSession
+from ..database.core import AsyncDbSession
 
 router = APIRouter(
     prefix='/auth',
@@ -13,12 +13,12 @@ router = APIRouter(
 
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register_user(request: Request, db: DbSession,
+async def register_user(request: Request, db: AsyncDbSession,
                         register_user_request: models.RegisterUserRequest):
-    service.register_user(db, register_user_request)
+    await service.register_user(db, register_user_request)
 
 
 @router.post("/login", response_model=models.Token)
 async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-                                 db: DbSession):
-    return service.login(form_data, db)
+                                 db: AsyncDbSession):
+    return await service.login(form_data, db)
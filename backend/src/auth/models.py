@@ -1,5 +1,5 @@
 from uuid import UUID
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, PrivateAttr
 
 class RegisterUserRequest(BaseModel):
     email: EmailStr
@@ -13,8 +13,12 @@ class Token(BaseModel):
     
 class TokenData(BaseModel):
     user_id: str | None = None
+    # Parsed once here rather than on every get_uuid() call
+    _user_uuid: UUID | None = PrivateAttr(default=None)
 
-    def get_uuid(self) -> UUID | None:
+    def model_post_init(self, __context) -> None:
         if self.user_id:
-            return UUID(self.user_id)
-        return None
\ No newline at end of file
+            self._user_uuid = UUID(self.user_id)
+
+    def get_uuid(self) -> UUID | None:
+        return self._user_uuid
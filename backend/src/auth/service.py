@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime, timezone
 from typing import Annotated
 from uuid import UUID, uuid4
@@ -5,17 +8,21 @@ from fastapi import Depends
 from passlib.context import CryptContext
 import jwt
 from jwt import PyJWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.entities.user import User
 from . import models
+from .token_cache import VerifiedTokenCache
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from ..exceptions import AuthenticationError
+from ..exceptions import AuthenticationError, ServiceBusyError
 import logging
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 # You would want to store this in an environment variable or a secret manager
@@ -26,6 +33,20 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/login')
 bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+# bcrypt is deliberately slow and CPU bound, so it runs on a small dedicated
+# pool instead of the event loop. Requests beyond workers + queue limit are
+# rejected with a 503 rather than piling up behind the pool.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+token_cache = VerifiedTokenCache(max_size=TOKEN_CACHE_SIZE)
+
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_hash_in_flight = 0
+_password_hash_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt_context.verify(plain_password, hashed_password)
@@ -35,10 +56,42 @@ def get_password_hash(password: str) -> str:
     return bcrypt_context.hash(password)
 
 
-def authenticate_user(email: str, password: str, db: Session) -> User | bool:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password):
-        logging.warning(f"Failed authentication attempt for email: {email}")
+def _release_password_hash_slot(_future) -> None:
+    # Runs on the worker thread that finished the hash
+    global _password_hash_in_flight
+    with _password_hash_lock:
+        _password_hash_in_flight -= 1
+
+
+async def _run_in_password_pool(func, *args):
+    global _password_hash_in_flight
+    with _password_hash_lock:
+        saturated = _password_hash_in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT
+        if not saturated:
+            _password_hash_in_flight += 1
+    if saturated:
+        logger.warning("Password hashing pool saturated, rejecting request")
+        raise ServiceBusyError()
+    future = password_hash_executor.submit(func, *args)
+    # The slot is freed when the hash finishes, not when the caller stops
+    # waiting: a disconnected client's bcrypt round still occupies a worker
+    future.add_done_callback(_release_password_hash_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_password_pool(get_password_hash, password)
+
+
+async def authenticate_user(email: str, password: str, db: AsyncSession) -> User | bool:
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if not user or not await verify_password_async(password, user.password):
+        logger.warning("Failed authentication attempt for email: %s", email)
         return False
     return user
 
@@ -53,42 +106,50 @@ def create_access_token(email: str, user_id: UUID, expires_delta: timedelta) ->
 
 
 def verify_token(token: str) -> models.TokenData:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get('id')
-        return models.TokenData(user_id=user_id)
-    except PyJWTError as e:
-        logging.warning(f"Token verification failed: {str(e)}")
+        token_data = models.TokenData(user_id=user_id)
+    except (PyJWTError, ValueError) as e:
+        logger.warning("Token verification failed: %s", e)
         raise AuthenticationError()
+    # exp is always set by create_access_token; tokens without one aren't cached
+    if 'exp' in payload:
+        token_cache.put(token, token_data, float(payload['exp']))
+    return token_data
 
 
-def register_user(db: Session, register_user_request: models.RegisterUserRequest) -> None:
+async def register_user(db: AsyncSession, register_user_request: models.RegisterUserRequest) -> None:
+    hashed_password = await get_password_hash_async(register_user_request.password)
     try:
         create_user_model = User(
             id=uuid4(),
             email=register_user_request.email,
             first_name=register_user_request.first_name,
             last_name=register_user_request.last_name,
-            password=get_password_hash(register_user_request.password)
+            password=hashed_password
         )
         db.add(create_user_model)
-        db.commit()
+        await db.commit()
     except Exception as e:
-        logging.error(
-            f"Failed to register user: {register_user_request.email}. Error: {str(e)}")
+        logger.error(
+            "Failed to register user: %s. Error: %s", register_user_request.email, e)
         raise
 
 
-def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> models.TokenData:
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> models.TokenData:
     return verify_token(token)
 
 
 CurrentUser = Annotated[models.TokenData, Depends(get_current_user)]
 
 
-def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-          db: Session) -> models.Token:
-    user = authenticate_user(form_data.username, form_data.password, db)
+async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+                db: AsyncSession) -> models.Token:
+    user = await authenticate_user(form_data.username, form_data.password, db)
 
     if not user:
         raise AuthenticationError()
@@ -0,0 +1,148 @@
+"""Per-request SQL statement tracking.
+
+`instrument_engine` times every statement. Inside a `track_queries` block
+(the middleware opens one per HTTP request) statements are also counted and
+grouped by shape, so repeated identical statements can be reported as a
+suspected N+1 when the block ends. Statements slower than SLOW_QUERY_MS are
+logged with the route they ran under.
+
+Tasks that outlive the request which started them (daily plan jobs, shared
+suggestion streams) run in a fresh context, so their statements aren't
+added to that request's log after it has been reported.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.metrics import DB_QUERY_DURATION, DB_REQUEST_QUERIES, DB_REQUEST_QUERY_DURATION
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+# Identical statement shapes run this many times in one request are reported
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:, \?)+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with placeholders and IN-list lengths normalized, so
+    the same query with different parameters has the same shape."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("?", shape)
+
+
+class QueryLog:
+    """`label` may be a callable, resolved when the label is used, e.g. to
+    report the route template once routing has run."""
+
+    def __init__(self, label: str | Callable[[], str]):
+        self._label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    @property
+    def label(self) -> str:
+        return self._label() if callable(self._label) else self._label
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common()
+                if count >= N_PLUS_ONE_THRESHOLD]
+
+    def server_timing(self) -> str:
+        timing = f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+        repeated = self.repeated()
+        if repeated:
+            timing += f', db-repeated;desc="{len(repeated)} repeated statements"'
+        return timing
+
+
+_current: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+
+@contextmanager
+def track_queries(label: str | Callable[[], str]):
+    """Collect the statements run inside the block and report suspected
+    N+1 patterns when it exits."""
+    log = QueryLog(label)
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+        for shape, count in log.repeated():
+            logging.warning(
+                f"Possible N+1 in {log.label}: {count} x {shape[:300]}")
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        log = _current.get()
+        if log is not None:
+            log.record(statement, elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            label = log.label if log is not None else "-"
+            logging.warning(
+                f"Slow query ({elapsed * 1000:.0f} ms) in {label}: {statement_shape(statement)[:500]}")
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+class QueryTrackingMiddleware:
+    """Tracks each request's statements, records them per route and, in
+    DEBUG mode, reports them in a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message):
+            if DEBUG and message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []),
+                                      (b"server-timing", log.server_timing().encode("latin-1"))]
+            await send(message)
+
+        # Labelled by route template, never the raw path, to bound cardinality
+        with track_queries(lambda: f"{scope['method']} {_route_path(scope)}") as log:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                path = _route_path(scope)
+                DB_REQUEST_QUERIES.labels(scope["method"], path).observe(log.count)
+                DB_REQUEST_QUERY_DURATION.labels(scope["method"], path).observe(log.seconds)
+
+
+def _route_path(scope) -> str:
+    # Set by the router before the endpoint runs
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
@@ -0,0 +1,20 @@
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    SQLAlchemy has no pool event that fires before a checkout blocks, so the
+    wait is timed around `_do_get`, the hook pool subclasses implement.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
@@ -0,0 +1,21 @@
+from datetime import timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """`timestamp without time zone` column holding UTC wall-clock time.
+
+    asyncpg rejects timezone-aware datetimes for naive timestamp columns
+    (psycopg2 silently dropped the offset), so aware values are converted
+    to naive UTC before binding.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
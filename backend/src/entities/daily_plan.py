@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime, timezone
@@ -13,7 +13,14 @@ class DailyPlan(Base):
         'users.id'), nullable=False)
     date = Column(Date, nullable=False)
     plan = Column(Text, nullable=False)
-    created_at = Column(DateTime, nullable=False,
+    # sha256 of the prompt inputs; set only once the plan finished generating
+    input_fingerprint = Column(String(64), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False,
                         default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(
         timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_daily_plans_user_id_date', 'user_id', 'date'),
+        Index('ix_daily_plans_user_id_created_at', 'user_id', 'created_at'),
+    )
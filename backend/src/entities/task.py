@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Integer
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, Computed, String, ForeignKey, Enum, Integer, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, ARRAY
 import uuid
 from datetime import datetime, timezone
 import enum
 from ..database.core import Base
+from ..database.types import UTCDateTime
+
+# Text search configuration for Task.search_vector; queries must use the same one
+SEARCH_CONFIG = "english"
 
 
 class Status(enum.Enum):
@@ -20,13 +24,30 @@ class Task(Base):
         'users.id'), nullable=False)
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
-    status = Column(Enum(Status), nullable=False, default=Status.Todo)
+    # Stored as VARCHAR (see the create tasks migration), not a native PG enum
+    status = Column(Enum(Status, native_enum=False),
+                    nullable=False, default=Status.Todo)
     total_minutes = Column(Integer, nullable=True)
-    created_at = Column(DateTime, nullable=False,
+    created_at = Column(UTCDateTime, nullable=False,
                         default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, nullable=False,
+    updated_at = Column(UTCDateTime, nullable=False,
                         default=lambda: datetime.now(timezone.utc),
                         onupdate=lambda: datetime.now(timezone.utc))
+    # Maintained by Postgres from title and description (title weighted
+    # higher). Only on the table, not the mapped entity, so task reads and
+    # RETURNING never fetch it; query it as Task.__table__.c.search_vector.
+    search_vector = Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+        persisted=True))
+
+    __table_args__ = (
+        Index('ix_tasks_user_id_status', 'user_id', 'status'),
+        Index('ix_tasks_user_id_created_at_id',
+              'user_id', 'created_at', 'id'),
+        Index('ix_tasks_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     def __repr__(self):
         return f"<Task(title='{self.title}', status='{self.status}', total_minutes={self.total_minutes})>"
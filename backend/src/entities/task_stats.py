@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Enum, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from ..database.core import Base
+from .task import Status
+
+
+class TaskStats(Base):
+    """Per-user task count and summed total_minutes for each status.
+
+    Derived from tasks: kept current by every write in tasks/service.py and
+    rebuilt from scratch by `python -m src.reconcile_task_stats`.
+    """
+    __tablename__ = 'task_stats'
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey(
+        'users.id', ondelete='CASCADE'), primary_key=True)
+    status = Column(Enum(Status, native_enum=False), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    # Tasks without an estimate count as 0
+    total_minutes = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskStats(status='{self.status}', task_count={self.task_count}, total_minutes={self.total_minutes})>"
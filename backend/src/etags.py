@@ -0,0 +1,43 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given version parts (ids, timestamps, counts)."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def _parse_header(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    tags = _parse_header(if_none_match)
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def version_etag(updated_at: datetime) -> str:
+    """ETag for a single row that encodes its naive-UTC updated_at, so an
+    If-Match value can be turned back into a WHERE condition."""
+    if updated_at.tzinfo is not None:
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return f'"{(updated_at - _EPOCH) // timedelta(microseconds=1):x}"'
+
+
+def parse_version_etag(etag: str) -> datetime | None:
+    try:
+        return _EPOCH + timedelta(microseconds=int(etag.strip().strip('"'), 16))
+    except ValueError:
+        return None
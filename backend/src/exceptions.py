@@ -18,6 +18,17 @@ class TaskCreationError(TaskError):
                          detail=f"Failed to create task: {error}")
 
 
+class TaskPreconditionFailedError(TaskError):
+    def __init__(self, task_id=None):
+        super().__init__(status_code=412,
+                         detail=f"Task with id {task_id} was modified by another request")
+
+
+class InvalidCursorError(TaskError):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid pagination cursor")
+
+
 class UserError(HTTPException):
     """Base exception for user-related errors"""
     pass
@@ -32,3 +43,19 @@ class UserNotFoundError(UserError):
 class AuthenticationError(HTTPException):
     def __init__(self, message: str = "Could not validate user"):
         super().__init__(status_code=401, detail=message)
+
+
+class ServiceBusyError(HTTPException):
+    def __init__(self, message: str = "Service is busy, please retry shortly", retry_after: int = 1):
+        super().__init__(status_code=503, detail=message,
+                         headers={"Retry-After": str(retry_after)})
+
+
+class UpstreamTimeoutError(HTTPException):
+    def __init__(self, message: str = "AI provider timed out"):
+        super().__init__(status_code=504, detail=message)
+
+
+class EmptyUpstreamResponseError(HTTPException):
+    def __init__(self, message: str = "AI provider returned an empty response"):
+        super().__init__(status_code=502, detail=message)
@@ -1,8 +1,20 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
 from enum import StrEnum
+from logging.handlers import QueueHandler, QueueListener
 
 LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 
+# "json" or "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Records waiting for the writer thread; past this, new records are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
 
 class LogLevels(StrEnum):
     info = "INFO"
@@ -11,16 +23,123 @@ class LogLevels(StrEnum):
     debug = "DEBUG"
 
 
+def parse_sample_rates(value: str) -> dict[str, float]:
+    """Parse "logger.name=0.1,other=0.5" into {"logger.name": 0.1, ...}."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+# Fraction of INFO/DEBUG records kept per logger (and its children)
+LOG_SAMPLE_RATES = parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.levelno <= logging.DEBUG:
+            entry["location"] = f"{record.pathname}:{record.funcName}:{record.lineno}"
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configured fraction of INFO and DEBUG records per logger.
+
+    A rate set for "src.tasks" also applies to "src.tasks.service". Warnings
+    and errors are never sampled out.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split(".")
+            for end in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:end])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Hands records to the writer thread without formatting them.
+
+    The stock QueueHandler merges the message and args on the calling
+    thread; here that happens in the listener, so the request path only pays
+    for creating the record. Log arguments must therefore not be mutated
+    after the call. Records are dropped rather than blocking when the queue
+    is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: QueueListener | None = None
+
+
+@atexit.register
+def _stop_listener():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def configure_logging(log_level: str = LogLevels.error):
+    global _listener
     log_level = str(log_level).upper()
     log_levels = [level.value for level in LogLevels]
 
     if log_level not in log_levels:
-        logging.basicConfig(level=LogLevels.error)
-        return
+        log_level = LogLevels.error
+
+    output = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    elif log_level == LogLevels.debug:
+        output.setFormatter(logging.Formatter(LOG_FORMAT_DEBUG))
+    else:
+        output.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
 
-    if log_level == LogLevels.debug:
-        logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
-        return
+    handler = DeferredQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+    logging.basicConfig(level=log_level, handlers=[handler], force=True)
 
-    logging.basicConfig(level=log_level)
+    _stop_listener()
+    # Formatting and writing happen on the listener's thread
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
@@ -1,13 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api import register_routes
+from .database.core import async_engine
+from .database.instrumentation import QueryTrackingMiddleware
+from .metrics import MetricsMiddleware, instrument_pool
 from .logger import configure_logging, LogLevels
+from .pregenerate import PREGENERATE_AT, run_daily
 import os
 
-configure_logging(LogLevels.info)
+configure_logging(os.getenv("LOG_LEVEL", LogLevels.info))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Daily plan pre-generation; enable PREGENERATE_AT on one instance only
+    scheduler = asyncio.create_task(run_daily(PREGENERATE_AT)) if PREGENERATE_AT else None
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 APP_URL = os.getenv("APP_URL")
 
@@ -17,6 +34,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+app.add_middleware(QueryTrackingMiddleware)
+app.add_middleware(MetricsMiddleware)
+instrument_pool(async_engine.sync_engine)
+
 register_routes(app)
@@ -0,0 +1,106 @@
+"""Prometheus metrics for HTTP requests, the database and LLM calls.
+
+Series are module-level so any layer can record into them without
+importing the app; `GET /metrics` exposes them in the text format.
+"""
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy.engine import Engine
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies",
+    ["method", "route", "status"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served")
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Duration of individual SQL statements")
+DB_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100))
+DB_REQUEST_QUERY_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Total SQL time per HTTP request",
+    ["method", "route"])
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections currently checked out of the pool")
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size, excluding overflow")
+
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds", "Time from acquiring an LLM slot to the first chunk",
+    ["operation"], buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30))
+LLM_STREAM_DURATION = Histogram(
+    "llm_stream_duration_seconds", "Total duration of an LLM call",
+    ["operation"], buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120))
+LLM_TOKENS_PER_SECOND = Histogram(
+    "llm_tokens_per_second", "Streamed chunks per second after the first chunk",
+    ["operation"], buckets=(1, 5, 10, 20, 40, 80, 160, 320))
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds", "Time spent waiting for an LLM concurrency slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30))
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    "llm_requests_in_flight", "LLM calls currently holding a concurrency slot")
+LLM_CALLS = Counter(
+    "llm_calls_total", "LLM calls by outcome", ["operation", "outcome"])
+
+PREGENERATION_USERS = Counter(
+    "daily_plan_pregeneration_users_total",
+    "Users processed by daily plan pre-generation, by result", ["result"])
+PREGENERATION_PENDING = Gauge(
+    "daily_plan_pregeneration_pending_users", "Users left in the current pre-generation run")
+PREGENERATION_LAST_RUN = Gauge(
+    "daily_plan_pregeneration_last_run_timestamp_seconds",
+    "When the last pre-generation run finished")
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task/queue overhead) that
+    records latency and status per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # Label by route template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], path, str(status)).observe(
+                time.perf_counter() - started)
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Expose `engine`'s pool usage, read at scrape time so there's nothing
+    to update on the hot path."""
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+        DB_POOL_SIZE.set_function(pool.size)
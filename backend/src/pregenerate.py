@@ -0,0 +1,204 @@
+"""Pre-generates today's daily plan for active users.
+
+Run before the workday so the morning rush reads saved plans instead of
+all generating at once:
+
+    python -m src.pregenerate --concurrency 4 --rate-per-minute 30
+
+Users whose plan for today is already complete and built from their current
+tasks are skipped, so an interrupted run can simply be started again. Set
+PREGENERATE_AT=HH:MM to have the API run it daily in-process instead.
+
+Generations are deduplicated per process only (DailyPlanJobManager): with
+PREGENERATE_AT a user who opens the app mid-run follows the running
+generation, but the CLI runs its own job manager, so a user who requests
+their plan while the CLI is generating it gets a second, separate
+generation. Run the CLI before users start work, or prefer PREGENERATE_AT.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+import openai
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from .ai.service import is_daily_plan_current, start_daily_plan_job
+from .auth.models import TokenData
+from .database.core import AsyncSessionLocal, async_engine
+from .entities.task import Task
+from .exceptions import ServiceBusyError
+from .metrics import PREGENERATION_LAST_RUN, PREGENERATION_PENDING, PREGENERATION_USERS
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Local time of day for the in-process daily run; unset disables it
+PREGENERATE_AT = os.getenv("PREGENERATE_AT")
+PREGENERATE_MODE = os.getenv("PREGENERATE_MODE", "llm")
+PREGENERATE_CONCURRENCY = int(os.getenv("PREGENERATE_CONCURRENCY", "4"))
+PREGENERATE_RATE_PER_MINUTE = float(os.getenv("PREGENERATE_RATE_PER_MINUTE", "30"))
+# Users with a task touched within this many days count as active
+PREGENERATE_ACTIVE_DAYS = int(os.getenv("PREGENERATE_ACTIVE_DAYS", "14"))
+MAX_ATTEMPTS = 3
+
+
+class RatePacer:
+    """Spaces generation starts `60 / rate_per_minute` seconds apart.
+
+    Rate limiting or a full job queue doubles the spacing (up to 16x);
+    each success moves it back towards the configured rate.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.base_interval = 60 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.interval = self.base_interval
+        self._next_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next_at - time.monotonic()
+            self._next_at = max(self._next_at, time.monotonic()) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def backoff(self) -> None:
+        self.interval = min(max(self.interval * 2, 1.0), max(self.base_interval, 1.0) * 16)
+
+    def succeeded(self) -> None:
+        self.interval = max(self.base_interval, self.interval * 0.75)
+
+
+async def get_active_user_ids(active_days: int) -> list[UUID]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=active_days)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Task.user_id).where(Task.updated_at >= cutoff).distinct())
+        return sorted(result.scalars().all())
+
+
+async def pregenerate_daily_plans(mode: str = PREGENERATE_MODE,
+                                  concurrency: int = PREGENERATE_CONCURRENCY,
+                                  rate_per_minute: float = PREGENERATE_RATE_PER_MINUTE,
+                                  active_days: int = PREGENERATE_ACTIVE_DAYS,
+                                  force: bool = False,
+                                  user_ids: list[UUID] | None = None) -> dict:
+    """Generates today's plan for each active user and returns counts by
+    result: generated, current (already up to date) and failed."""
+    if user_ids is None:
+        user_ids = await get_active_user_ids(active_days)
+    queue: asyncio.Queue[tuple[UUID, int]] = asyncio.Queue()
+    for user_id in user_ids:
+        queue.put_nowait((user_id, 1))
+    counts = {"generated": 0, "current": 0, "failed": 0}
+    pacer = RatePacer(rate_per_minute)
+    started = time.monotonic()
+    PREGENERATION_PENDING.set(len(user_ids))
+
+    def record(result: str) -> None:
+        counts[result] += 1
+        PREGENERATION_USERS.labels(result).inc()
+        PREGENERATION_PENDING.dec()
+
+    async def worker():
+        while not queue.empty():
+            user_id, attempt = queue.get_nowait()
+            try:
+                if not force:
+                    async with AsyncSessionLocal() as db:
+                        if await is_daily_plan_current(user_id, db, mode):
+                            record("current")
+                            continue
+                await pacer.wait()
+                # Runs as a regular plan job. In-process (PREGENERATE_AT) a
+                # user who opens the app meanwhile joins it; requests served
+                # by another process, e.g. while the CLI runs, don't see it
+                job = start_daily_plan_job(TokenData(user_id=str(user_id)), force, mode)
+                await job.wait()
+                pacer.succeeded()
+                record("generated")
+            except (ServiceBusyError, openai.RateLimitError) as e:
+                pacer.backoff()
+                if attempt < MAX_ATTEMPTS:
+                    logger.warning("Throttled generating plan for user %s, retrying later: %s",
+                                   user_id, e)
+                    queue.put_nowait((user_id, attempt + 1))
+                else:
+                    logger.error("Giving up on plan for user %s: %s", user_id, e)
+                    record("failed")
+            except Exception as e:
+                logger.error("Failed to pre-generate plan for user %s: %s", user_id, e)
+                record("failed")
+
+    async def report():
+        while True:
+            await asyncio.sleep(10)
+            done = sum(counts.values())
+            elapsed = time.monotonic() - started
+            logger.info("Pre-generation progress: %d/%d users (%s) in %.0fs",
+                        done, len(user_ids), counts, elapsed)
+
+    logger.info("Pre-generating %s daily plans for %d users", mode, len(user_ids))
+    reporter = asyncio.create_task(report())
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        reporter.cancel()
+        PREGENERATION_PENDING.set(0)
+    PREGENERATION_LAST_RUN.set_to_current_time()
+    logger.info("Pre-generation finished in %.0fs: %s", time.monotonic() - started, counts)
+    return counts
+
+
+def _seconds_until(at: str) -> float:
+    now = datetime.now()
+    target = datetime.combine(date.today(), datetime.strptime(at, "%H:%M").time())
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def run_daily(at: str) -> None:
+    """In-process scheduler: pre-generate every day at local time `at`.
+    Enable it on one API instance only."""
+    while True:
+        await asyncio.sleep(_seconds_until(at))
+        try:
+            await pregenerate_daily_plans()
+        except Exception as e:
+            logger.error("Scheduled pre-generation failed: %s", e)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate today's daily plans.")
+    parser.add_argument("--mode", choices=["llm", "local", "polished"], default=PREGENERATE_MODE)
+    parser.add_argument("--concurrency", type=int, default=PREGENERATE_CONCURRENCY)
+    parser.add_argument("--rate-per-minute", type=float, default=PREGENERATE_RATE_PER_MINUTE,
+                        help="maximum generations started per minute")
+    parser.add_argument("--active-days", type=int, default=PREGENERATE_ACTIVE_DAYS)
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate plans that are already up to date")
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            return await pregenerate_daily_plans(
+                args.mode, args.concurrency, args.rate_per_minute, args.active_days, args.force)
+        finally:
+            await async_engine.dispose()
+
+    counts = asyncio.run(run())
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    from .logger import configure_logging, LogLevels
+    configure_logging(os.getenv("LOG_LEVEL", LogLevels.info))
+    main()
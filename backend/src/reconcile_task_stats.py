@@ -0,0 +1,45 @@
+"""Rebuilds the task_stats summary table from tasks.
+
+    python -m src.reconcile_task_stats            # fix every user
+    python -m src.reconcile_task_stats --check    # report drift, exit 1 if any
+    python -m src.reconcile_task_stats --user-id <uuid>
+
+Safe to run while the API is serving writes (see rebuild_task_stats).
+"""
+import argparse
+from uuid import UUID
+
+from .database.core import SessionLocal
+from .tasks.stats import find_stats_drift, rebuild_task_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild task_stats from tasks.")
+    parser.add_argument("--check", action="store_true",
+                        help="only report rows that don't match, exit 1 if there are any")
+    parser.add_argument("--user-id", type=UUID, help="limit to one user")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            drift = find_stats_drift(db, args.user_id)
+        else:
+            drift = rebuild_task_stats(db, args.user_id)
+            db.commit()
+    finally:
+        db.close()
+
+    for user_id, status, stored, actual in drift:
+        print(f"{user_id} {status.name}: stored {stored[0]} tasks/{stored[1]} min, "
+              f"actual {actual[0]} tasks/{actual[1]} min")
+    if args.check:
+        print(f"{len(drift)} task_stats rows out of date")
+        if drift:
+            raise SystemExit(1)
+    else:
+        print(f"Corrected {len(drift)} task_stats rows")
+
+
+if __name__ == "__main__":
+    main()
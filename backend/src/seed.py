@@ -5,6 +5,7 @@ from .entities.user import User
 from .entities.task import Task, Status
 from .entities.daily_plan import DailyPlan
 from .auth.service import get_password_hash
+from .tasks.stats import rebuild_task_stats
 
 from .logger import configure_logging, LogLevels
 
@@ -61,11 +62,12 @@ def seed():
             print(f"Demo user already exists: {user.email}")
 
         # 2. Seed tasks (idempotent by title+user)
+        existing_titles = {title for (title,) in db.query(Task.title).filter(
+            Task.user_id == user.id,
+            Task.title.in_([task_data["title"] for task_data in DEMO_TASKS]),
+        )}
         for task_data in DEMO_TASKS:
-            task = db.query(Task).filter_by(
-                user_id=user.id, title=task_data["title"]
-            ).first()
-            if not task:
+            if task_data["title"] not in existing_titles:
                 task = Task(
                     user_id=user.id,
                     created_at=datetime.now(timezone.utc),
@@ -75,6 +77,9 @@ def seed():
                 db.add(task)
                 print(f"Created demo task: {task.title}")
         db.commit()
+        # Tasks were inserted directly, so bring task_stats up to date
+        rebuild_task_stats(db, user.id)
+        db.commit()
 
         # 3. Seed daily plan (idempotent by user+date)
         today = date.today()
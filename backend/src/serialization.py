@@ -0,0 +1,15 @@
+import os
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# Serve list endpoints from column-level selects encoded straight to JSON
+# bytes, skipping per-row model validation and the stdlib JSON encoder.
+FAST_LIST_RESPONSES = os.getenv(
+    "FAST_LIST_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+
+def typed_json_response(adapter: TypeAdapter, content, headers: dict | None = None,
+                        status_code: int = 200) -> Response:
+    return Response(content=adapter.dump_json(content), status_code=status_code,
+                    headers=headers, media_type="application/json")
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, status, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, Header, Query, Request, Response, status, BackgroundTasks
+from typing import Annotated, List
 from uuid import UUID
 
-from ..database.core import DbSession
+from ..database.core import AsyncDbSession
 from . import models
 from . import service
 from ..auth.service import CurrentUser
+from ..etags import etag_matches, not_modified, parse_version_etag, version_etag
+from ..exceptions import TaskPreconditionFailedError
+from ..serialization import FAST_LIST_RESPONSES, typed_json_response
 
 router = APIRouter(
     prefix="/tasks",
@@ -14,25 +17,83 @@ router = APIRouter(
 
 
 @router.post("/", response_model=models.TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(db: DbSession, task: models.TaskCreate, current_user: CurrentUser, background_tasks: BackgroundTasks):
-    return service.create_task(current_user, db, task, background_tasks)
+async def create_task(db: AsyncDbSession, task: models.TaskCreate, current_user: CurrentUser, background_tasks: BackgroundTasks):
+    return await service.create_task(current_user, db, task, background_tasks)
 
 
 @router.get("/", response_model=List[models.TaskResponse])
-def get_tasks(db: DbSession, current_user: CurrentUser):
-    return service.get_tasks(current_user, db)
+async def get_tasks(db: AsyncDbSession, current_user: CurrentUser, request: Request, response: Response,
+                    params: Annotated[models.TaskListParams, Query()]):
+    etag = await service.get_tasks_etag(current_user, db, request.url.query)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    fast = FAST_LIST_RESPONSES or params.fields is not None
+    page = await service.get_tasks(current_user, db, params, as_rows=fast)
+    headers = {"ETag": etag}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if fast:
+        # Rows are plain (possibly projected) dicts, encoded without
+        # going through TaskResponse validation
+        return typed_json_response(models.task_rows_adapter, page.items, headers)
+    response.headers.update(headers)
+    return page.items
+
+
+# Declared before /{task_id} so "stats" and "search" aren't parsed as task ids
+@router.get("/stats", response_model=models.TaskStatsResponse)
+async def get_task_stats(db: AsyncDbSession, current_user: CurrentUser):
+    return await service.get_task_stats(current_user, db)
+
+
+@router.get("/search", response_model=List[models.TaskResponse])
+async def search_tasks(db: AsyncDbSession, current_user: CurrentUser, response: Response,
+                       params: Annotated[models.TaskSearchParams, Query()]):
+    page = await service.search_tasks(current_user, db, params)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.post("/bulk", response_model=models.TaskBulkResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_tasks(db: AsyncDbSession, bulk: models.TaskBulkCreate, current_user: CurrentUser):
+    return await service.bulk_create_tasks(current_user, db, bulk)
+
+
+@router.patch("/bulk", response_model=models.TaskBulkResponse)
+async def bulk_update_tasks(db: AsyncDbSession, bulk: models.TaskBulkUpdate, current_user: CurrentUser):
+    return await service.bulk_update_tasks(current_user, db, bulk)
+
+
+@router.delete("/bulk", response_model=models.TaskBulkDeleteResponse)
+async def bulk_delete_tasks(db: AsyncDbSession, bulk: models.TaskBulkDelete, current_user: CurrentUser):
+    return await service.bulk_delete_tasks(current_user, db, bulk)
 
 
 @router.get("/{task_id}", response_model=models.TaskResponse)
-def get_task(db: DbSession, task_id: UUID, current_user: CurrentUser):
-    return service.get_task_by_id(current_user, db, task_id)
+async def get_task(db: AsyncDbSession, task_id: UUID, current_user: CurrentUser, request: Request, response: Response):
+    task = await service.get_task_by_id(current_user, db, task_id)
+    etag = version_etag(task.updated_at)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return task
 
 
 @router.put("/{task_id}", response_model=models.TaskResponse)
-def update_task(db: DbSession, task_id: UUID, task_update: models.TaskUpdate, current_user: CurrentUser, background_tasks: BackgroundTasks):
-    return service.update_task(current_user, db, task_id, task_update, background_tasks)
+async def update_task(db: AsyncDbSession, task_id: UUID, task_update: models.TaskUpdate, current_user: CurrentUser, background_tasks: BackgroundTasks,
+                      response: Response, if_match: Annotated[str | None, Header()] = None):
+    expected_updated_at = None
+    if if_match is not None and if_match.strip() != "*":
+        expected_updated_at = parse_version_etag(if_match)
+        if expected_updated_at is None:
+            raise TaskPreconditionFailedError(task_id)
+    task = await service.update_task(current_user, db, task_id, task_update, background_tasks,
+                                     expected_updated_at=expected_updated_at)
+    response.headers["ETag"] = version_etag(task.updated_at)
+    return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(db: DbSession, task_id: UUID, current_user: CurrentUser, background_tasks: BackgroundTasks):
-    service.delete_task(current_user, db, task_id, background_tasks)
+async def delete_task(db: AsyncDbSession, task_id: UUID, current_user: CurrentUser, background_tasks: BackgroundTasks):
+    await service.delete_task(current_user, db, task_id, background_tasks)
@@ -1,9 +1,17 @@
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing_extensions import TypedDict
 from src.entities.task import Status
 
+# In TaskResponse's field order, which the fast path's JSON keys follow
+TASK_FIELDS = ("title", "description", "id", "total_minutes",
+               "status", "created_at", "updated_at")
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 100
+MAX_BULK_SIZE = 500
+
 
 class TaskBase(BaseModel):
     title: str
@@ -11,7 +19,7 @@ class TaskBase(BaseModel):
 
 
 class TaskCreate(TaskBase):
-    total_minutes: int
+    total_minutes: int = Field(ge=0)
 
 
 class TaskResponse(TaskBase):
@@ -24,8 +32,106 @@ class TaskResponse(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskRow(TypedDict, total=False):
+    """Plain-dict shape of TaskResponse for the fast list path; keys are in
+    the same order so the JSON output is identical."""
+    title: str
+    description: str
+    id: UUID
+    total_minutes: Optional[int]
+    status: Status
+    created_at: datetime
+    updated_at: datetime
+
+
+task_rows_adapter = TypeAdapter(list[TaskRow])
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    total_minutes: Optional[int] = None
+    total_minutes: Optional[int] = Field(default=None, ge=0)
     status: Optional[Status] = None
+
+
+class TaskListParams(BaseModel):
+    status: Optional[list[Status]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    fields: Optional[str] = None
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        unknown = set(value.split(",")) - set(TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return value
+
+    def field_list(self) -> list[str] | None:
+        if self.fields is None:
+            return None
+        return [f for f in TASK_FIELDS if f in self.fields.split(",")]
+
+
+class TaskSearchParams(BaseModel):
+    q: str = Field(min_length=1, max_length=200)
+    status: Optional[list[Status]] = None
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class TaskStatusStats(BaseModel):
+    status: Status
+    count: int
+    total_minutes: int
+
+
+class TaskStatsResponse(BaseModel):
+    statuses: list[TaskStatusStats]
+    total_count: int
+    total_minutes: int
+    # Todo and In Progress
+    remaining_minutes: int
+
+
+class TaskPage(BaseModel):
+    items: list
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkCreate(BaseModel):
+    items: list[TaskCreate] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: UUID
+
+
+class TaskBulkUpdate(BaseModel):
+    items: list[TaskBulkUpdateItem] = Field(
+        min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskBulkDelete(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    detail: str
+
+
+class TaskBulkResponse(BaseModel):
+    items: list[TaskResponse]
+    errors: list[TaskBulkError] = []
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    deleted: list[UUID]
+    errors: list[TaskBulkError] = []
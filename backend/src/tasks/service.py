@@ -1,63 +1,329 @@
+import base64
 from datetime import datetime, timezone
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, cast, column, delete, func, insert, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import BackgroundTasks
 from . import models
+from .stats import apply_stats_delta, stats_delta
 from src.auth.models import TokenData
-from src.entities.task import Task
-from src.exceptions import TaskCreationError, TaskNotFoundError
+from src.entities.task import SEARCH_CONFIG, Status, Task
+from src.entities.task_stats import TaskStats
+from src.exceptions import InvalidCursorError, TaskCreationError, TaskNotFoundError, TaskPreconditionFailedError
 from src.ai.service import generate_daily_plan_for_user
 import logging
+from src.etags import make_etag
 from src.entities.daily_plan import DailyPlan
 
+logger = logging.getLogger(__name__)
+# Per-read lines are high volume; sample them via LOG_SAMPLE_RATES
+read_logger = logging.getLogger(f"{__name__}.reads")
 
-def create_task(current_user: TokenData, db: Session, task: models.TaskCreate, background_tasks: BackgroundTasks = None) -> Task:
+NON_NULLABLE_FIELDS = ("title", "description", "status")
+
+
+async def create_task(current_user: TokenData, db: AsyncSession, task: models.TaskCreate, background_tasks: BackgroundTasks = None) -> Task:
     try:
-        new_task = Task(**task.model_dump())
-        new_task.user_id = current_user.get_uuid()
-        db.add(new_task)
-        db.commit()
-        db.refresh(new_task)
-        logging.info(f"Created new task for user: {current_user.get_uuid()}")
+        new_task = await db.scalar(insert(Task).values(
+            **task.model_dump(), user_id=current_user.get_uuid()).returning(Task))
+        await apply_stats_delta(db, current_user.get_uuid(), stats_delta(
+            added=[(new_task.status, new_task.total_minutes)]))
+        await db.commit()
+        logger.info("Created new task for user: %s", current_user.get_uuid())
         return new_task
     except Exception as e:
-        logging.error(
-            f"Failed to create task for user {current_user.get_uuid()}. Error: {str(e)}")
+        logger.error(
+            "Failed to create task for user %s. Error: %s", current_user.get_uuid(), e)
         raise TaskCreationError(str(e))
 
 
-def get_tasks(current_user: TokenData, db: Session) -> list[models.TaskResponse]:
-    tasks = db.query(Task).filter(
-        Task.user_id == current_user.get_uuid()).all()
-    logging.info(
-        f"Retrieved {len(tasks)} tasks for user: {current_user.get_uuid()}")
-    return tasks
+def encode_cursor(created_at: datetime, task_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{task_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, task_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except ValueError:
+        raise InvalidCursorError()
+
+
+async def get_tasks(current_user: TokenData, db: AsyncSession, params: models.TaskListParams | None = None, as_rows: bool = False) -> models.TaskPage:
+    """With `as_rows` (or a `fields` projection) items are plain dicts built
+    from a column-level select rather than ORM entities."""
+    params = params or models.TaskListParams()
+    fields = params.field_list()
+    if fields is None and as_rows:
+        fields = list(models.TASK_FIELDS)
+    if fields is None:
+        query = select(Task)
+    else:
+        # created_at and id are always fetched since the cursor is built on them
+        columns = set(fields) | {"created_at", "id"}
+        query = select(*(getattr(Task, name) for name in models.TASK_FIELDS
+                         if name in columns))
+
+    query = query.where(Task.user_id == current_user.get_uuid())
+    if params.status:
+        query = query.where(Task.status.in_(params.status))
+    if params.created_after:
+        query = query.where(Task.created_at >= params.created_after)
+    if params.created_before:
+        query = query.where(Task.created_at < params.created_before)
+    if params.cursor:
+        created_at, task_id = decode_cursor(params.cursor)
+        query = query.where(
+            tuple_(Task.created_at, Task.id) > tuple_(created_at, task_id))
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(Task.created_at, Task.id).limit(params.limit + 1)
+
+    result = await db.execute(query)
+    rows = result.scalars().all() if fields is None else result.all()
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    if fields is not None:
+        rows = [{name: getattr(row, name) for name in fields} for row in rows]
+    read_logger.info(
+        "Retrieved %d tasks for user: %s", len(rows), current_user.get_uuid())
+    return models.TaskPage(items=rows, next_cursor=next_cursor)
+
+
+def encode_search_cursor(rank: float, task_id: UUID) -> str:
+    raw = f"{rank!r}|{task_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        rank, task_id = raw.split("|", 1)
+        return float(rank), UUID(task_id)
+    except ValueError:
+        raise InvalidCursorError()
+
+
+async def search_tasks(current_user: TokenData, db: AsyncSession, params: models.TaskSearchParams) -> models.TaskPage:
+    """Full-text search over the user's task titles and descriptions, best
+    matches first. `q` takes web search syntax ("quoted phrases", or,
+    -excluded) and is matched through the GIN-indexed search_vector."""
+    search_vector = Task.__table__.c.search_vector
+    ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), params.q)
+    rank = func.ts_rank_cd(search_vector, ts_query, type_=Float).label("rank")
+
+    query = select(Task, rank).where(
+        Task.user_id == current_user.get_uuid(), search_vector.op("@@")(ts_query))
+    if params.status:
+        query = query.where(Task.status.in_(params.status))
+    if params.cursor:
+        last_rank, task_id = decode_search_cursor(params.cursor)
+        query = query.where(tuple_(rank, Task.id) < tuple_(last_rank, task_id))
+    # Ranks tie often, so id breaks ties to keep the keyset order total
+    query = query.order_by(rank.desc(), Task.id.desc()).limit(params.limit + 1)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_search_cursor(rows[-1].rank, rows[-1].Task.id)
+    read_logger.info(
+        "Found %d tasks matching search for user: %s", len(rows), current_user.get_uuid())
+    return models.TaskPage(items=[row.Task for row in rows], next_cursor=next_cursor)
+
+
+async def get_task_stats(current_user: TokenData, db: AsyncSession) -> models.TaskStatsResponse:
+    """Counts and minutes per status from task_stats, without touching tasks."""
+    result = await db.execute(select(TaskStats.status, TaskStats.task_count, TaskStats.total_minutes)
+                              .where(TaskStats.user_id == current_user.get_uuid()))
+    stored = {status: (count, minutes) for status, count, minutes in result.all()}
+    statuses = [models.TaskStatusStats(status=status, count=stored.get(status, (0, 0))[0],
+                                       total_minutes=stored.get(status, (0, 0))[1])
+                for status in Status]
+    read_logger.info("Retrieved task stats for user: %s", current_user.get_uuid())
+    return models.TaskStatsResponse(
+        statuses=statuses,
+        total_count=sum(entry.count for entry in statuses),
+        total_minutes=sum(entry.total_minutes for entry in statuses),
+        remaining_minutes=sum(entry.total_minutes for entry in statuses
+                              if entry.status != Status.Done))
 
 
-def get_task_by_id(current_user: TokenData, db: Session, task_id: UUID) -> Task:
-    task = db.query(Task).filter(Task.id == task_id).filter(
-        Task.user_id == current_user.get_uuid()).first()
+async def get_task_by_id(current_user: TokenData, db: AsyncSession, task_id: UUID) -> Task:
+    result = await db.execute(select(Task).where(Task.id == task_id).where(
+        Task.user_id == current_user.get_uuid()))
+    task = result.scalars().first()
     if not task:
-        logging.warning(
-            f"Task {task_id} not found for user {current_user.get_uuid()}")
+        logger.warning(
+            "Task %s not found for user %s", task_id, current_user.get_uuid())
         raise TaskNotFoundError(task_id)
-    logging.info(
-        f"Retrieved task {task_id} for user {current_user.get_uuid()}")
+    read_logger.info(
+        "Retrieved task %s for user %s", task_id, current_user.get_uuid())
     return task
 
 
-def update_task(current_user: TokenData, db: Session, task_id: UUID, task_update: models.TaskUpdate, background_tasks: BackgroundTasks = None) -> Task:
+async def update_task(current_user: TokenData, db: AsyncSession, task_id: UUID, task_update: models.TaskUpdate, background_tasks: BackgroundTasks = None, expected_updated_at: datetime | None = None) -> Task:
     task_data = task_update.model_dump(exclude_unset=True)
-    db.query(Task).filter(Task.id == task_id).filter(
-        Task.user_id == current_user.get_uuid()).update(task_data)
-    db.commit()
-    logging.info(
-        f"Successfully updated task {task_id} for user {current_user.get_uuid()}")
-    return get_task_by_id(current_user, db, task_id)
-
-
-def delete_task(current_user: TokenData, db: Session, task_id: UUID, background_tasks: BackgroundTasks = None) -> None:
-    task = get_task_by_id(current_user, db, task_id)
-    db.delete(task)
-    db.commit()
-    logging.info(f"Task {task_id} deleted by user {current_user.get_uuid()}")
+    # Locked self-join so RETURNING also gives the pre-update values for task_stats
+    previous = select(Task.id, Task.status, Task.total_minutes).where(
+        Task.id == task_id, Task.user_id == current_user.get_uuid()).with_for_update().subquery("previous")
+    query = update(Task).where(Task.id == previous.c.id)
+    if expected_updated_at is not None:
+        # Optimistic concurrency: only apply if nobody changed the row since
+        query = query.where(Task.updated_at == expected_updated_at)
+    # populate_existing: a Task already in the session must take the new values
+    row = (await db.execute(query.values(**task_data)
+                            .returning(Task, previous.c.status, previous.c.total_minutes)
+                            .execution_options(synchronize_session=False,
+                                               populate_existing=True))).first()
+    task = row[0] if row else None
+    if not task:
+        if expected_updated_at is not None and await _task_exists(current_user, db, task_id):
+            logger.warning(
+                "Task %s changed since it was read by user %s", task_id, current_user.get_uuid())
+            raise TaskPreconditionFailedError(task_id)
+        logger.warning(
+            "Task %s not found for user %s", task_id, current_user.get_uuid())
+        raise TaskNotFoundError(task_id)
+    await apply_stats_delta(db, current_user.get_uuid(), stats_delta(
+        added=[(task.status, task.total_minutes)], removed=[(row[1], row[2])]))
+    await db.commit()
+    logger.info(
+        "Successfully updated task %s for user %s", task_id, current_user.get_uuid())
+    return task
+
+
+async def _task_exists(current_user: TokenData, db: AsyncSession, task_id: UUID) -> bool:
+    return await db.scalar(select(Task.id).where(Task.id == task_id).where(
+        Task.user_id == current_user.get_uuid())) is not None
+
+
+async def get_tasks_etag(current_user: TokenData, db: AsyncSession, query_string: str = "") -> str:
+    """Version of the user's task list without loading it: any create,
+    update or delete changes either the row count or the latest updated_at."""
+    count, last_updated = (await db.execute(
+        select(func.count(Task.id), func.max(Task.updated_at)).where(
+            Task.user_id == current_user.get_uuid()))).one()
+    return make_etag(current_user.get_uuid(), count, last_updated, query_string)
+
+
+async def delete_task(current_user: TokenData, db: AsyncSession, task_id: UUID, background_tasks: BackgroundTasks = None) -> None:
+    deleted = (await db.execute(delete(Task).where(Task.id == task_id).where(
+        Task.user_id == current_user.get_uuid()).returning(Task.status, Task.total_minutes))).first()
+    if not deleted:
+        logger.warning(
+            "Task %s not found for user %s", task_id, current_user.get_uuid())
+        raise TaskNotFoundError(task_id)
+    await apply_stats_delta(db, current_user.get_uuid(), stats_delta(removed=[tuple(deleted)]))
+    await db.commit()
+    logger.info("Task %s deleted by user %s", task_id, current_user.get_uuid())
+
+
+async def bulk_create_tasks(current_user: TokenData, db: AsyncSession, bulk: models.TaskBulkCreate) -> models.TaskBulkResponse:
+    user_id = current_user.get_uuid()
+    rows = [{**item.model_dump(), "user_id": user_id} for item in bulk.items]
+    try:
+        result = await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True), rows)
+        tasks = result.all()
+        await apply_stats_delta(db, user_id, stats_delta(
+            added=[(task.status, task.total_minutes) for task in tasks]))
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(
+            "Failed to bulk create tasks for user %s. Error: %s", user_id, e)
+        raise TaskCreationError(str(e))
+    logger.info("Bulk created %d tasks for user: %s", len(tasks), user_id)
+    return models.TaskBulkResponse(items=tasks)
+
+
+async def bulk_update_tasks(current_user: TokenData, db: AsyncSession, bulk: models.TaskBulkUpdate) -> models.TaskBulkResponse:
+    user_id = current_user.get_uuid()
+    errors: list[models.TaskBulkError] = []
+    # Items touching the same set of columns share one UPDATE ... FROM (VALUES ...)
+    groups: dict[tuple[str, ...], list[tuple[int, models.TaskBulkUpdateItem, dict]]] = {}
+    seen: set[UUID] = set()
+    for index, item in enumerate(bulk.items):
+        data = item.model_dump(exclude_unset=True, exclude={"id"})
+        if item.id in seen:
+            errors.append(models.TaskBulkError(
+                index=index, id=item.id, detail="Duplicate task id in batch"))
+            continue
+        if not data:
+            errors.append(models.TaskBulkError(
+                index=index, id=item.id, detail="No fields to update"))
+            continue
+        null_fields = [name for name in NON_NULLABLE_FIELDS if name in data and data[name] is None]
+        if null_fields:
+            errors.append(models.TaskBulkError(
+                index=index, id=item.id, detail=f"Fields cannot be null: {', '.join(null_fields)}"))
+            continue
+        seen.add(item.id)
+        groups.setdefault(tuple(sorted(data)), []).append((index, item, data))
+
+    updated: dict[UUID, Task] = {}
+    added, removed = [], []
+    if len(groups) > 1:
+        # Each UPDATE below locks only its own rows; take them all up front
+        # in id order so overlapping batches can't deadlock
+        await db.execute(select(Task.id).where(Task.id.in_(seen), Task.user_id == user_id)
+                         .order_by(Task.id).with_for_update())
+    for columns, items in groups.items():
+        rows = values(column("id", Task.id.type),
+                      *(column(name, getattr(Task, name).type) for name in columns),
+                      name="task_updates").data(
+            [(item.id, *(data[name] for name in columns)) for _, item, data in items])
+        # Rows are locked in id order, the same in every writer
+        previous = select(Task.id, Task.status, Task.total_minutes).where(
+            Task.id.in_([item.id for _, item, _ in items]), Task.user_id == user_id
+        ).order_by(Task.id).with_for_update().subquery("previous")
+        stmt = (update(Task)
+                .where(Task.id == rows.c.id, Task.id == previous.c.id)
+                .values({name: rows.c[name] for name in columns})
+                .returning(Task, previous.c.status, previous.c.total_minutes)
+                .execution_options(synchronize_session=False, populate_existing=True))
+        for task, old_status, old_minutes in (await db.execute(stmt)).all():
+            updated[task.id] = task
+            added.append((task.status, task.total_minutes))
+            removed.append((old_status, old_minutes))
+    await apply_stats_delta(db, user_id, stats_delta(added=added, removed=removed))
+    await db.commit()
+
+    for index, item, _ in (entry for items in groups.values() for entry in items):
+        if item.id not in updated:
+            errors.append(models.TaskBulkError(
+                index=index, id=item.id, detail=f"Task with id {item.id} not found"))
+    errors.sort(key=lambda error: error.index)
+    logger.info("Bulk updated %d tasks for user: %s", len(updated), user_id)
+    return models.TaskBulkResponse(
+        items=[updated[task_id] for task_id in dict.fromkeys(item.id for item in bulk.items)
+               if task_id in updated],
+        errors=errors)
+
+
+async def bulk_delete_tasks(current_user: TokenData, db: AsyncSession, bulk: models.TaskBulkDelete) -> models.TaskBulkDeleteResponse:
+    user_id = current_user.get_uuid()
+    # Rows are locked in id order, as in bulk_update_tasks, so
+    # overlapping batches can't deadlock
+    locked = select(Task.id).where(Task.id.in_(bulk.ids), Task.user_id == user_id
+                                   ).order_by(Task.id).with_for_update()
+    result = await db.execute(
+        delete(Task).where(Task.id.in_(locked.scalar_subquery()))
+        .returning(Task.id, Task.status, Task.total_minutes))
+    rows = result.all()
+    deleted = {row.id for row in rows}
+    await apply_stats_delta(db, user_id, stats_delta(
+        removed=[(row.status, row.total_minutes) for row in rows]))
+    await db.commit()
+    errors = [models.TaskBulkError(index=index, id=task_id, detail=f"Task with id {task_id} not found")
+              for index, task_id in enumerate(bulk.ids) if task_id not in deleted]
+    logger.info("Bulk deleted %d tasks for user: %s", len(deleted), user_id)
+    return models.TaskBulkDeleteResponse(
+        deleted=[task_id for task_id in dict.fromkeys(bulk.ids) if task_id in deleted],
+        errors=errors)
@@ -0,0 +1,94 @@
+"""Maintenance of the task_stats summary table.
+
+Each write in service.py turns the (status, total_minutes) of the tasks it
+added and removed into a per-status delta and applies it with one upsert,
+before committing, so the summary changes atomically with the tasks.
+"""
+from collections import defaultdict
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.entities.task import Status, Task
+from src.entities.task_stats import TaskStats
+
+# (status, total_minutes) of one task
+TaskAmount = tuple[Status, int | None]
+
+
+def stats_delta(added: Iterable[TaskAmount] = (),
+                removed: Iterable[TaskAmount] = ()) -> dict[Status, tuple[int, int]]:
+    """(count, minutes) change per status; statuses that net to zero are left out."""
+    changes: dict[Status, list[int]] = defaultdict(lambda: [0, 0])
+    for sign, amounts in ((1, added), (-1, removed)):
+        for status, minutes in amounts:
+            changes[status][0] += sign
+            changes[status][1] += sign * (minutes or 0)
+    return {status: (count, minutes) for status, (count, minutes) in changes.items()
+            if count or minutes}
+
+
+async def apply_stats_delta(db: AsyncSession, user_id: UUID,
+                            delta: dict[Status, tuple[int, int]]) -> None:
+    if not delta:
+        return
+    # Fixed row order, so concurrent writers lock a user's stats rows in
+    # the same order and can't deadlock on them
+    stmt = pg_insert(TaskStats).values([
+        {"user_id": user_id, "status": status, "task_count": count, "total_minutes": minutes}
+        for status, (count, minutes) in sorted(delta.items(), key=lambda item: item[0].name)
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[TaskStats.user_id, TaskStats.status],
+        set_={"task_count": TaskStats.task_count + stmt.excluded.task_count,
+              "total_minutes": TaskStats.total_minutes + stmt.excluded.total_minutes}))
+
+
+def find_stats_drift(db: Session, user_id: UUID | None = None) -> list[tuple]:
+    """(user_id, status, stored (count, minutes), actual (count, minutes))
+    for every stats row that doesn't match the tasks table."""
+    actual_query = select(Task.user_id, Task.status, func.count(),
+                          func.coalesce(func.sum(Task.total_minutes), 0)
+                          ).group_by(Task.user_id, Task.status)
+    stored_query = select(TaskStats.user_id, TaskStats.status,
+                          TaskStats.task_count, TaskStats.total_minutes)
+    if user_id is not None:
+        actual_query = actual_query.where(Task.user_id == user_id)
+        stored_query = stored_query.where(TaskStats.user_id == user_id)
+    actual = {(row[0], row[1]): (row[2], row[3]) for row in db.execute(actual_query)}
+    stored = {(row[0], row[1]): (row[2], row[3]) for row in db.execute(stored_query)}
+    drift = []
+    for key in sorted(actual.keys() | stored.keys(), key=lambda key: (str(key[0]), key[1].name)):
+        # A stored all-zero row is equivalent to a missing one
+        stored_amount = stored.get(key, (0, 0))
+        actual_amount = actual.get(key, (0, 0))
+        if stored_amount != actual_amount:
+            drift.append((*key, stored_amount, actual_amount))
+    return drift
+
+
+def rebuild_task_stats(db: Session, user_id: UUID | None = None) -> list[tuple]:
+    """Recompute task_stats from tasks (for one user, or everyone) and
+    return the drift that was corrected. The caller commits.
+
+    Holds an EXCLUSIVE lock on task_stats until commit: task writes already
+    past their stats upsert are waited for, and ones that haven't got there
+    yet wait and then apply their delta on top of the rebuilt rows. Reads
+    of task_stats are not blocked.
+    """
+    db.execute(text("LOCK TABLE task_stats IN EXCLUSIVE MODE"))
+    drift = find_stats_drift(db, user_id)
+    if drift:
+        stmt = pg_insert(TaskStats).values([
+            {"user_id": stats_user_id, "status": status, "task_count": count, "total_minutes": minutes}
+            for stats_user_id, status, _, (count, minutes) in drift
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TaskStats.user_id, TaskStats.status],
+            set_={"task_count": stmt.excluded.task_count,
+                  "total_minutes": stmt.excluded.total_minutes}))
+    return drift
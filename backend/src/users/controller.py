@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from ..database.core import DbSession
+from ..database.core import AsyncDbSession
 from . import models
 from . import service
 from ..auth.service import CurrentUser
@@ -12,5 +12,5 @@ router = APIRouter(
 
 
 @router.get("/me", response_model=models.UserResponse)
-def get_current_user(current_user: CurrentUser, db: DbSession):
-    return service.get_user_by_id(db, current_user.get_uuid())
+async def get_current_user(current_user: CurrentUser, db: AsyncDbSession):
+    return await service.get_user_by_id(db, current_user.get_uuid())
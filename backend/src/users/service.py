@@ -1,15 +1,20 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models
 from src.entities.user import User
 from src.exceptions import UserNotFoundError
 import logging
 
+logger = logging.getLogger(__name__)
+read_logger = logging.getLogger(f"{__name__}.reads")
 
-def get_user_by_id(db: Session, user_id: UUID) -> models.UserResponse:
-    user = db.query(User).filter(User.id == user_id).first()
+
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> models.UserResponse:
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
-        logging.warning(f"User not found with ID: {user_id}")
+        logger.warning("User not found with ID: %s", user_id)
         raise UserNotFoundError(user_id)
-    logging.info(f"Successfully retrieved user with ID: {user_id}")
+    read_logger.info("Successfully retrieved user with ID: %s", user_id)
     return user
@@ -0,0 +1,85 @@
+"""Shared fixtures.
+
+Tests that touch the database run against the Postgres database in
+TEST_DATABASE_URL, migrated to head on first use, and are skipped when it
+is unset. Never point it at a database whose data you want to keep.
+"""
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# src reads its configuration at import time, so this runs before any
+# src import. DATABASE_URL is always overridden so a developer's .env is
+# never used; without a test database the engines are created but unused.
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://tests@localhost/unused"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["LLM_PROVIDER"] = "mock"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("LOG_LEVEL", "WARN")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+
+
+@pytest.fixture
+def user(database):
+    """A fresh user, removed with everything it owns afterwards."""
+    from sqlalchemy import delete
+    from src.auth.models import TokenData
+    from src.database.core import engine
+    from src.entities.daily_plan import DailyPlan
+    from src.entities.task import Task
+    from src.entities.user import User
+
+    user_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            id=user_id, email=f"test-{user_id}@example.com", first_name="Test",
+            last_name="User", password="x"))
+    yield TokenData(user_id=str(user_id))
+    with engine.begin() as conn:
+        conn.execute(delete(DailyPlan).where(DailyPlan.user_id == user_id))
+        conn.execute(delete(Task).where(Task.user_id == user_id))
+        conn.execute(delete(User).where(User.id == user_id))
+
+
+@pytest.fixture
+def auth_headers(user):
+    from src.auth.service import create_access_token
+    token = create_access_token(f"test-{user.user_id}@example.com", user.get_uuid(),
+                                timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def db(database):
+    from src.database.core import AsyncSessionLocal, async_engine
+    async with AsyncSessionLocal() as session:
+        yield session
+    # Pooled asyncpg connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def client(database):
+    from fastapi.testclient import TestClient
+    from src.database.core import async_engine
+    from src.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(async_engine.dispose)
@@ -0,0 +1,16 @@
+def parse_sse(raw: str) -> list[dict]:
+    """Complete events in an SSE body, parsed the way EventSource does:
+    `data` is the event's data lines joined with "\\n"."""
+    events = []
+    for block in raw.replace("\r\n", "\n").split("\n\n")[:-1]:
+        event: dict = {"data": []}
+        for line in block.split("\n"):
+            field, _, value = line.partition(":")
+            value = value.removeprefix(" ")
+            if field == "data":
+                event["data"].append(value)
+            elif field in ("id", "event"):
+                event[field] = value
+        event["data"] = "\n".join(event["data"])
+        events.append(event)
+    return events
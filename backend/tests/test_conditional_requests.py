@@ -0,0 +1,66 @@
+import pytest
+
+from src.auth.service import get_current_user
+from src.main import app
+
+
+@pytest.fixture
+def api(client, user):
+    """The test client, authenticated as `user` through a dependency override."""
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def create_task(api) -> dict:
+    response = api.post("/tasks/", json={"title": "Write report", "description": "Q3", "total_minutes": 30})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_task_list_if_none_match(api):
+    create_task(api)
+    first = api.get("/tasks/")
+    etag = first.headers["ETag"]
+
+    cached = api.get("/tasks/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    create_task(api)
+    changed = api.get("/tasks/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_task_if_none_match(api):
+    task = create_task(api)
+    etag = api.get(f"/tasks/{task['id']}").headers["ETag"]
+
+    assert api.get(f"/tasks/{task['id']}", headers={"If-None-Match": etag}).status_code == 304
+    assert api.get(f"/tasks/{task['id']}", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_task_update_if_match(api):
+    task = create_task(api)
+    etag = api.get(f"/tasks/{task['id']}").headers["ETag"]
+
+    updated = api.put(f"/tasks/{task['id']}", json={"status": "Done"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["status"] == "Done"
+    assert updated.headers["ETag"] != etag
+
+    # A second writer still holding the old version is refused
+    stale = api.put(f"/tasks/{task['id']}", json={"status": "Todo"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert api.get(f"/tasks/{task['id']}").json()["status"] == "Done"
+
+    assert api.put(f"/tasks/{task['id']}", json={"status": "Todo"},
+                   headers={"If-Match": updated.headers["ETag"]}).status_code == 200
+
+
+def test_daily_plan_history_if_none_match(api):
+    etag = api.get("/ai/daily-plan/history").headers["ETag"]
+    assert api.get("/ai/daily-plan/history", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.ai.llm import MockProvider
+from src.ai.service import llm
+from src.database.core import engine
+from src.entities.daily_plan import DailyPlan
+from tests.helpers import parse_sse
+
+PLAN = "## Morning\n\n- Review PRs\n- Write report\n\n## Afternoon\n\n- Ship it\n" * 40
+
+
+@pytest.fixture
+def saved_plan(user):
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(DailyPlan.__table__.insert().values(
+            id=user.get_uuid(), user_id=user.get_uuid(), date=date.today(), plan=PLAN,
+            created_at=now, updated_at=now))
+    return PLAN
+
+
+def streamed_text(response) -> str:
+    assert response.status_code == 200
+    return "".join(event["data"] for event in parse_sse(response.text))
+
+
+def test_reconnect_replays_saved_plan_from_last_event_id(client, auth_headers, saved_plan):
+    response = client.post("/ai/daily-plan/generate",
+                           headers={**auth_headers, "Last-Event-ID": "0"})
+    events = parse_sse(response.text)
+    assert len(events) > 1
+    assert "".join(event["data"] for event in events) == saved_plan
+
+    # Resuming after any event the client received yields exactly the rest
+    offset = int(events[1]["id"])
+    resumed = client.post("/ai/daily-plan/generate",
+                          headers={**auth_headers, "Last-Event-ID": str(offset)})
+    assert streamed_text(resumed) == saved_plan[offset:]
+
+    done = client.post("/ai/daily-plan/generate",
+                       headers={**auth_headers, "Last-Event-ID": str(len(saved_plan))})
+    assert streamed_text(done) == ""
+
+
+def todays_plans(user) -> list:
+    with engine.connect() as conn:
+        return conn.execute(select(DailyPlan.id, DailyPlan.plan).where(
+            DailyPlan.user_id == user.get_uuid(), DailyPlan.date == date.today())).all()
+
+
+@pytest.mark.parametrize("mode", ["local", "llm"])
+def test_unchanged_tasks_replay_the_saved_plan(client, auth_headers, user, mode):
+    response = client.post("/tasks/bulk", headers=auth_headers, json={"items": [
+        {"title": f"Task {i}", "description": "Test task", "total_minutes": 30} for i in range(3)]})
+    assert response.status_code == 201
+
+    generated = streamed_text(client.post("/ai/daily-plan/generate", headers=auth_headers,
+                                          params={"mode": mode}))
+    [(plan_id, saved)] = todays_plans(user)
+    assert generated == saved
+    assert "\n" in saved
+
+    # The same tasks again: the saved multi-line plan is replayed, not rebuilt
+    replayed = streamed_text(client.post("/ai/daily-plan/generate", headers=auth_headers,
+                                         params={"mode": mode}))
+    assert replayed == saved
+    assert todays_plans(user) == [(plan_id, saved)]
+
+
+def test_reconnect_without_a_plan_is_404(client, auth_headers):
+    response = client.post("/ai/daily-plan/generate",
+                           headers={**auth_headers, "Last-Event-ID": "10"})
+    assert response.status_code == 404
+
+
+def test_rejected_generation_is_503_and_keeps_the_saved_plan(client, auth_headers, user,
+                                                              saved_plan, monkeypatch):
+    monkeypatch.setattr(llm, "max_concurrent", 0)
+    monkeypatch.setattr(llm, "queue_limit", 0)
+
+    assert client.post("/ai/daily-plan/generate", headers=auth_headers).status_code == 503
+    assert [plan for _, plan in todays_plans(user)] == [saved_plan]
+
+    # Reconnecting after the failure resumes from the saved plan
+    resumed = client.post("/ai/daily-plan/generate",
+                          headers={**auth_headers, "Last-Event-ID": "10"})
+    assert streamed_text(resumed) == saved_plan[10:]
+
+
+def test_empty_generation_is_502_and_keeps_the_saved_plan(client, auth_headers, user,
+                                                           saved_plan, monkeypatch):
+    monkeypatch.setattr(llm, "provider", MockProvider(text=""))
+
+    assert client.post("/ai/daily-plan/generate", headers=auth_headers).status_code == 502
+    assert [plan for _, plan in todays_plans(user)] == [saved_plan]
+    with engine.connect() as conn:
+        fingerprint = conn.execute(select(DailyPlan.input_fingerprint).where(
+            DailyPlan.user_id == user.get_uuid())).scalar_one()
+    assert fingerprint is None
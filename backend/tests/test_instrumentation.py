@@ -0,0 +1,32 @@
+import logging
+from uuid import uuid4
+
+from src.ai.plan_jobs import DailyPlanJobManager
+from src.database import instrumentation
+from src.database.instrumentation import track_queries
+
+
+def test_slow_queries_are_labelled_by_route_template(client, auth_headers, caplog, monkeypatch):
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 0)
+    task_id = uuid4()
+
+    with caplog.at_level(logging.WARNING):
+        assert client.get(f"/tasks/{task_id}", headers=auth_headers).status_code == 404
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert slow
+    assert all(" in GET /tasks/{task_id}: " in message for message in slow)
+    assert not any(str(task_id) in message for message in slow)
+
+
+async def test_jobs_started_by_a_request_do_not_share_its_query_log():
+    manager = DailyPlanJobManager(max_workers=1, queue_limit=1)
+    seen = []
+
+    async def produce():
+        seen.append(instrumentation._current.get())
+        yield "plan"
+
+    with track_queries("POST /ai/daily-plan/generate"):
+        job = manager.start(uuid4(), produce)
+        await job.wait()
+    assert seen == [None]
@@ -0,0 +1,56 @@
+"""The series GET /metrics exposes, after a request through the app."""
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from src.auth.models import TokenData
+from src.auth.service import get_current_user
+from src.main import app
+
+
+@pytest.fixture
+def api():
+    app.dependency_overrides[get_current_user] = lambda: TokenData(user_id=str(uuid4()))
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def scrape(api) -> dict[str, list]:
+    """Samples by series name."""
+    response = api.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    samples: dict[str, list] = {}
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            samples.setdefault(sample.name, []).append(sample)
+    return samples
+
+
+def test_metrics_exposes_http_db_and_llm_series(api):
+    assert api.post("/ai/suggest", json={"title": f"Write report {uuid4()}"}).status_code == 200
+    assert api.get(f"/no-such-page/{uuid4()}").status_code == 404
+    samples = scrape(api)
+
+    for name in ("http_requests_in_flight", "db_query_duration_seconds_count",
+                 "http_request_db_queries_count", "db_pool_checkout_wait_seconds_count",
+                 "db_pool_checked_out_connections", "db_pool_size",
+                 "llm_time_to_first_token_seconds_count", "llm_stream_duration_seconds_count",
+                 "llm_tokens_per_second_count", "llm_queue_wait_seconds_count",
+                 "llm_requests_in_flight", "llm_calls_total",
+                 "daily_plan_pregeneration_pending_users"):
+        assert name in samples, name
+
+    routes = {(s.labels["method"], s.labels["route"], s.labels["status"])
+              for s in samples["http_request_duration_seconds_count"]}
+    assert ("POST", "/ai/suggest", "200") in routes
+    # Unmatched paths share one label value instead of one series per path
+    assert ("GET", "unmatched", "404") in routes
+    assert not any(route.startswith("/no-such-page") for _, route, _ in routes)
+
+    calls = {(s.labels["operation"], s.labels["outcome"]): s.value
+             for s in samples["llm_calls_total"]}
+    assert calls[("suggest", "ok")] >= 1
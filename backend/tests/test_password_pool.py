@@ -0,0 +1,67 @@
+"""The bounded bcrypt pool: requests past workers + queue limit get a 503,
+and a slot stays taken until its hash finishes, even if the caller is gone."""
+import asyncio
+import threading
+
+import pytest
+
+from src.auth import service
+from src.exceptions import ServiceBusyError
+
+
+@pytest.fixture
+def blocked_pool(monkeypatch):
+    """Queue limit 1, so the pool takes workers + 1 hashes. Submitting the
+    returned event's `wait` occupies a slot until the event is set."""
+    monkeypatch.setattr(service, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def capacity() -> int:
+    return service.PASSWORD_HASH_WORKERS + service.PASSWORD_HASH_QUEUE_LIMIT
+
+
+async def wait_for_in_flight(count: int) -> None:
+    for _ in range(200):
+        if service._password_hash_in_flight == count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"in flight: {service._password_hash_in_flight}, expected {count}")
+
+
+async def test_saturated_pool_is_503(blocked_pool):
+    calls = [asyncio.create_task(service._run_in_password_pool(blocked_pool.wait))
+             for _ in range(capacity())]
+    await wait_for_in_flight(capacity())
+
+    with pytest.raises(ServiceBusyError) as error:
+        await service.verify_password_async("password", service.get_password_hash("password"))
+    assert error.value.status_code == 503
+
+    blocked_pool.set()
+    await asyncio.gather(*calls)
+    await wait_for_in_flight(0)
+    assert await service.verify_password_async("password", service.get_password_hash("password"))
+
+
+async def test_cancelled_callers_keep_their_slot_until_the_hash_finishes(blocked_pool):
+    calls = [asyncio.create_task(service._run_in_password_pool(blocked_pool.wait))
+             for _ in range(capacity())]
+    await wait_for_in_flight(capacity())
+    # Clients disconnect; the running hashes can't be stopped
+    for call in calls:
+        call.cancel()
+    await asyncio.gather(*calls, return_exceptions=True)
+
+    # Only the queued job was dropped; the workers are still busy
+    await wait_for_in_flight(service.PASSWORD_HASH_WORKERS)
+    queued = asyncio.create_task(service._run_in_password_pool(blocked_pool.wait))
+    await wait_for_in_flight(capacity())
+    with pytest.raises(ServiceBusyError):
+        await service._run_in_password_pool(blocked_pool.wait)
+
+    blocked_pool.set()
+    await queued
+    await wait_for_in_flight(0)
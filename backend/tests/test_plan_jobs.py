@@ -0,0 +1,54 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.ai.plan_jobs import DailyPlanJobManager
+from src.exceptions import ServiceBusyError
+
+
+async def test_readers_are_released_when_a_job_is_cancelled():
+    manager = DailyPlanJobManager(max_workers=1, queue_limit=1)
+    user_id = uuid4()
+    started = asyncio.Event()
+
+    async def produce():
+        yield "partial "
+        started.set()
+        await asyncio.Event().wait()
+
+    job = manager.start(user_id, produce)
+    await started.wait()
+    for task in manager._tasks:
+        task.cancel()
+
+    with pytest.raises(ServiceBusyError):
+        await asyncio.wait_for(job.wait(), timeout=1)
+    assert job.text == "partial "
+    assert manager.get(user_id) is job
+
+
+async def test_failed_job_passes_its_error_to_readers():
+    manager = DailyPlanJobManager(max_workers=1, queue_limit=1)
+
+    async def produce():
+        yield "partial "
+        raise ValueError("upstream failed")
+
+    job = manager.start(uuid4(), produce)
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(job.wait(), timeout=1)
+
+
+async def test_job_failing_before_output_is_not_retained():
+    manager = DailyPlanJobManager(max_workers=1, queue_limit=1)
+    user_id = uuid4()
+
+    async def produce():
+        raise ServiceBusyError()
+        yield
+
+    job = manager.start(user_id, produce)
+    with pytest.raises(ServiceBusyError):
+        await asyncio.wait_for(job.wait(), timeout=1)
+    assert manager.get(user_id) is None
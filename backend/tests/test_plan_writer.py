@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from src.ai import plan_writer
+from src.ai.plan_writer import DailyPlanWriter
+
+
+class StubSession:
+    """Records what the plan text was at each commit."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.commits: list[str] = []
+
+    async def commit(self):
+        self.commits.append(self.plan.plan)
+
+
+def make_writer(**kwargs) -> tuple[DailyPlanWriter, StubSession]:
+    plan = SimpleNamespace(plan="", updated_at=None)
+    db = StubSession(plan)
+    return DailyPlanWriter(db, plan, **kwargs), db
+
+
+async def test_writes_once_per_flush_bytes_not_per_chunk():
+    writer, db = make_writer(flush_interval=3600, flush_bytes=2048)
+    text = "token " * 2000  # 12,000 bytes in 2,000 chunks
+    for chunk in text.split(" ")[:-1]:
+        await writer.append(chunk + " ")
+    await writer.close()
+
+    assert writer.flush_count == len(db.commits) == 6
+    assert db.commits[-1] == text
+    assert writer.plan.updated_at is not None
+
+
+async def test_flushes_after_interval(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(plan_writer.time, "monotonic", lambda: now[0])
+    writer, db = make_writer(flush_interval=1.0, flush_bytes=1_000_000)
+
+    await writer.append("a")
+    now[0] += 0.5
+    await writer.append("b")
+    assert writer.flush_count == 0
+    now[0] += 0.6
+    await writer.append("c")
+    assert db.commits == ["abc"]
+
+
+async def test_close_writes_only_pending_text():
+    writer, db = make_writer(flush_interval=3600, flush_bytes=4)
+    await writer.append("abcd")
+    await writer.close()
+    assert db.commits == ["abcd"]
+
+    await writer.append("e")
+    await writer.close()
+    assert db.commits == ["abcd", "abcde"]
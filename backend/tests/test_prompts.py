@@ -0,0 +1,60 @@
+"""Daily plan prompt size stays within its token budget however many
+tasks the user has."""
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.ai.prompts import PLAN_PROMPT_TOKEN_BUDGET, TokenCounter, build_daily_plan_prompt
+from src.entities.task import Status, Task
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.fixture(scope="module")
+def counter():
+    return TokenCounter("gpt-3.5-turbo")
+
+
+def make_tasks(count: int) -> list[Task]:
+    created = datetime(2026, 10, 1)
+    return [Task(id=uuid4(), title=f"Task {i}",
+                 description="Draft the quarterly report and review the numbers. " * (1 + i % 20),
+                 status=Status.InProgress if i % 4 == 0 else Status.Todo,
+                 total_minutes=15 * (1 + i % 8), created_at=created + timedelta(minutes=i))
+            for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 10, 100, 1000, 5000])
+def test_prompt_stays_within_budget(counter, count):
+    prompt = build_daily_plan_prompt(make_tasks(count), TODAY, counter)
+    assert counter.count(prompt) <= PLAN_PROMPT_TOKEN_BUDGET
+
+
+def test_prompt_size_plateaus_as_tasks_grow(counter):
+    sizes = [counter.count(build_daily_plan_prompt(make_tasks(count), TODAY, counter))
+             for count in (500, 1000, 5000)]
+    # Once the budget is reached, more tasks only change the summary line
+    assert max(sizes) - min(sizes) < 20
+
+
+def test_omitted_tasks_are_summarized(counter):
+    tasks = make_tasks(1000)
+    prompt = build_daily_plan_prompt(tasks, TODAY, counter)
+
+    listed = [line for line in prompt.splitlines() if line.startswith("- Task ")]
+    assert 0 < len(listed) < len(tasks)
+    # In Progress tasks come first
+    assert all("Status: In Progress" in line for line in listed[:len(listed) // 2])
+    omitted = len(tasks) - len(listed)
+    assert f"...and {omitted} more lower-priority tasks not listed" in prompt
+
+
+def test_long_descriptions_are_truncated(counter):
+    [task] = make_tasks(1)
+    task.description = "word " * 5000
+    prompt = build_daily_plan_prompt([task], TODAY, counter, description_max_tokens=50)
+
+    line = next(line for line in prompt.splitlines() if line.startswith("- Task 0"))
+    assert counter.count(line) < 100
+    assert "..." in line
@@ -0,0 +1,81 @@
+"""Statements per task operation, counted with track_queries: single
+writes are one RETURNING statement plus the task_stats upsert, and bulk
+operations don't grow with the batch size."""
+import pytest
+
+from src.database.instrumentation import track_queries
+from src.entities.task import Status
+from src.exceptions import TaskNotFoundError
+from src.tasks import models, service
+
+
+def statements(log) -> list[str]:
+    """"VERB table" for each statement, e.g. "INSERT tasks"."""
+    result = []
+    for shape in log.shapes.elements():
+        words = shape.split()
+        verb = words[0].upper()
+        keyword = {"INSERT": "INTO", "UPDATE": "UPDATE", "DELETE": "FROM", "SELECT": "FROM"}[verb]
+        table = words[[w.upper() for w in words].index(keyword) + 1]
+        result.append(f"{verb} {table}")
+    return sorted(result)
+
+
+def new_tasks(count: int) -> list[models.TaskCreate]:
+    return [models.TaskCreate(title=f"Task {i}", description="Test task", total_minutes=15)
+            for i in range(count)]
+
+
+async def test_single_task_writes(db, user):
+    with track_queries("create") as log:
+        task = await service.create_task(user, db, new_tasks(1)[0])
+    assert statements(log) == ["INSERT task_stats", "INSERT tasks"]
+
+    with track_queries("update") as log:
+        updated = await service.update_task(user, db, task.id, models.TaskUpdate(status=Status.Done))
+    assert statements(log) == ["INSERT task_stats", "UPDATE tasks"]
+    assert updated.status == Status.Done
+
+    with track_queries("delete") as log:
+        await service.delete_task(user, db, task.id)
+    assert statements(log) == ["DELETE tasks", "INSERT task_stats"]
+
+    with track_queries("update missing") as log:
+        with pytest.raises(TaskNotFoundError):
+            await service.update_task(user, db, task.id, models.TaskUpdate(title="Gone"))
+    await db.rollback()
+    assert statements(log) == ["UPDATE tasks"]
+
+
+@pytest.mark.parametrize("count", [1, 100])
+async def test_bulk_writes_do_not_scale_with_batch_size(db, user, count):
+    with track_queries("bulk create") as log:
+        created = await service.bulk_create_tasks(user, db, models.TaskBulkCreate(items=new_tasks(count)))
+    assert statements(log) == ["INSERT task_stats", "INSERT tasks"]
+    ids = [task.id for task in created.items]
+
+    with track_queries("bulk update") as log:
+        await service.bulk_update_tasks(user, db, models.TaskBulkUpdate(items=[
+            models.TaskBulkUpdateItem(id=task_id, status=Status.InProgress) for task_id in ids]))
+    assert statements(log) == ["INSERT task_stats", "UPDATE tasks"]
+
+    with track_queries("bulk delete") as log:
+        await service.bulk_delete_tasks(user, db, models.TaskBulkDelete(ids=ids))
+    assert statements(log) == ["DELETE tasks", "INSERT task_stats"]
+
+
+async def test_reads_are_one_statement(db, user):
+    created = await service.bulk_create_tasks(user, db, models.TaskBulkCreate(items=new_tasks(50)))
+
+    with track_queries("list") as log:
+        page = await service.get_tasks(user, db)
+    assert len(page.items) == 50
+    assert statements(log) == ["SELECT tasks"]
+
+    with track_queries("get") as log:
+        await service.get_task_by_id(user, db, created.items[0].id)
+    assert statements(log) == ["SELECT tasks"]
+
+    with track_queries("stats") as log:
+        await service.get_task_stats(user, db)
+    assert statements(log) == ["SELECT task_stats"]
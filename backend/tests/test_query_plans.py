@@ -0,0 +1,86 @@
+"""Every query the task and daily plan services run must be able to use an
+index. Statements are captured while calling the services, then EXPLAINed
+with sequential scans disabled: on a small test table the planner would
+pick a Seq Scan anyway, but with them disabled it only does so when no
+usable index exists."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, insert
+
+from src.ai import service as ai_service
+from src.database.core import async_engine
+from src.entities.daily_plan import DailyPlan
+from src.entities.task import Status
+from src.tasks import models, service
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def capture(calls) -> list[tuple[str, tuple]]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for call in calls:
+            await call()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def test_service_queries_use_indexes(db, user):
+    user_id = user.get_uuid()
+    created = (await service.bulk_create_tasks(user, db, models.TaskBulkCreate(items=[
+        models.TaskCreate(title=f"Write report {i}", description="Quarterly numbers",
+                          total_minutes=30) for i in range(3)]))).items
+    await db.execute(insert(DailyPlan).values(
+        user_id=user_id, date=datetime.now().date(), plan="## Plan",
+        created_at=datetime.now(timezone.utc), updated_at=datetime.now(timezone.utc)))
+    await db.commit()
+    first, second, third = (task.id for task in created)
+    page = await service.get_tasks(user, db, models.TaskListParams(limit=1))
+
+    statements = await capture([
+        lambda: service.get_tasks(user, db, models.TaskListParams(
+            status=[Status.Todo], created_after=datetime.now() - timedelta(days=1),
+            created_before=datetime.now() + timedelta(days=1))),
+        lambda: service.get_tasks(user, db, models.TaskListParams(cursor=page.next_cursor)),
+        lambda: service.get_tasks(user, db, models.TaskListParams(fields="id,title")),
+        lambda: service.search_tasks(user, db, models.TaskSearchParams(q="report")),
+        lambda: service.get_task_stats(user, db),
+        lambda: service.get_tasks_etag(user, db),
+        lambda: service.get_task_by_id(user, db, first),
+        lambda: service.update_task(user, db, first, models.TaskUpdate(status=Status.InProgress)),
+        lambda: service.bulk_update_tasks(user, db, models.TaskBulkUpdate(items=[
+            models.TaskBulkUpdateItem(id=second, status=Status.Done)])),
+        lambda: service.delete_task(user, db, first),
+        lambda: service.bulk_delete_tasks(user, db, models.TaskBulkDelete(ids=[second, third])),
+        lambda: ai_service.get_daily_plan_for_user(user_id, db),
+        lambda: ai_service.get_daily_plan_etag(user_id, db),
+        lambda: ai_service.get_daily_plan_history_etag(user_id, db),
+        lambda: ai_service.is_daily_plan_current(user_id, db),
+        lambda: ai_service.get_all_daily_plans_for_user(user_id, db),
+        lambda: ai_service.get_daily_plan_history_rows(user_id, db),
+    ])
+    explained = [(s, p) for s, p in statements
+                 if s.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE")]
+    assert len(explained) >= 17
+
+    seq_scans = []
+    async with async_engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in explained:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()[0]["Plan"]
+            for node in plan_nodes(plan):
+                if node["Node Type"] == "Seq Scan":
+                    seq_scans.append(f"{node['Relation Name']}: {' '.join(statement.split())}")
+    assert not seq_scans, "\n".join(seq_scans)
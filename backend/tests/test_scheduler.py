@@ -0,0 +1,31 @@
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from src.ai.scheduler import render_schedule, schedule_day
+from src.entities.task import Status, Task
+
+DAY = date(2026, 10, 18)
+
+
+def make_task(minutes: int | None, status: Status = Status.Todo, age: int = 0) -> Task:
+    return Task(id=uuid4(), title=f"Task {minutes}", description="", status=status,
+                total_minutes=minutes, created_at=datetime(2026, 10, 1) - timedelta(minutes=age))
+
+
+def test_fills_the_day_preferring_older_tasks():
+    tasks = [make_task(240, age=1), make_task(240, age=3), make_task(240, age=2)]
+    schedule = schedule_day(tasks, DAY, workday_minutes=480, break_every=0)
+
+    assert schedule.scheduled == [tasks[1], tasks[2]]
+    assert schedule.deferred == [tasks[0]]
+
+
+def test_negative_estimates_are_scheduled_as_zero_minutes():
+    # Rows stored before estimates were validated
+    tasks = [make_task(-30), make_task(-500, Status.InProgress, age=1), make_task(60, age=2)]
+    schedule = schedule_day(tasks, DAY, workday_minutes=480)
+
+    assert {id(task) for task in schedule.scheduled} == {id(task) for task in tasks}
+    assert schedule.scheduled_minutes == 60
+    assert all(block.minutes >= 0 for block in schedule.blocks)
+    render_schedule(schedule)
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from src.ai.sse import coalesce, sse_event, sse_text_events, started
+from tests.helpers import parse_sse
+
+PLAN = "## Morning\n\n- Review PRs\r\n- Write report\n\n## Afternoon\n- Ship it\n"
+
+
+@pytest.mark.parametrize("text", ["one line", "", "a\nb", "\n\nlead and trail\n", "x\r\ny\rz"])
+def test_event_round_trips_text(text):
+    [event] = parse_sse(sse_event(text, 7))
+    assert event == {"id": "7", "data": text.replace("\r\n", "\n").replace("\r", "\n")}
+
+
+def test_text_events_resume_from_any_received_id():
+    events = parse_sse("".join(sse_text_events(PLAN, chunk_chars=10)))
+    assert len(events) > 1
+    assert "".join(event["data"] for event in events) == PLAN.replace("\r\n", "\n")
+    for event in events:
+        # A client that reconnects after this event gets exactly the rest
+        offset = int(event["id"])
+        rest = parse_sse("".join(sse_text_events(PLAN, offset, chunk_chars=10)))
+        assert "".join(e["data"] for e in rest) == PLAN[offset:].replace("\r\n", "\n")
+
+
+def test_text_events_never_split_crlf():
+    ids = [int(e["id"]) for e in parse_sse("".join(sse_text_events("ab\r\ncd", chunk_chars=3)))]
+    assert ids == [4, 6]
+
+
+class Upstream:
+    """A source stream that records whether it was closed."""
+
+    def __init__(self, chunks: int):
+        self.chunks = chunks
+        self.closed = False
+        self.blocked = asyncio.Event()
+
+    async def stream(self):
+        try:
+            for i in range(self.chunks):
+                yield f"chunk {i} "
+            self.blocked.set()
+            await asyncio.Event().wait()
+        finally:
+            self.closed = True
+
+
+async def test_coalesce_closes_its_source_when_closed():
+    upstream = Upstream(chunks=3)
+    frames = coalesce(upstream.stream(), interval_ms=10)
+    assert await anext(frames) == "chunk 0 chunk 1 chunk 2 "
+    await frames.aclose()
+    assert upstream.closed
+
+
+async def test_coalesce_closes_its_source_when_cancelled():
+    upstream = Upstream(chunks=1)
+
+    async def consume():
+        async for _ in coalesce(upstream.stream(), interval_ms=10):
+            pass
+
+    consumer = asyncio.create_task(consume())
+    await upstream.blocked.wait()
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+    assert upstream.closed
+
+
+async def test_started_stream_closes_its_source_when_closed():
+    upstream = Upstream(chunks=2)
+    chunks = await started(upstream.stream())
+    assert await anext(chunks) == "chunk 0 "
+    await chunks.aclose()
+    assert upstream.closed
@@ -0,0 +1,66 @@
+"""Upstream failures on /ai/suggest: before the first chunk they are the
+response's status, after it they end the stream with an `error` event."""
+import base64
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.ai.llm import MockProvider
+from src.ai.service import llm
+from src.auth.models import TokenData
+from src.auth.service import get_current_user
+from src.main import app
+from tests.helpers import parse_sse
+
+
+@pytest.fixture
+def api():
+    """A test client authenticated through a dependency override; /ai/suggest
+    doesn't touch the database."""
+    app.dependency_overrides[get_current_user] = lambda: TokenData(user_id=str(uuid4()))
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def suggest(api):
+    # A fresh title, so the suggestion cache can't answer
+    return api.post("/ai/suggest", json={"title": f"Write report {uuid4()}"})
+
+
+def test_suggest_streams_description(api):
+    response = suggest(api)
+    assert response.status_code == 200
+    text = "".join(base64.b64decode(event["data"]).decode() for event in parse_sse(response.text))
+    assert text == MockProvider.DEFAULT_TEXT
+
+
+def test_full_queue_is_503(api, monkeypatch):
+    monkeypatch.setattr(llm, "max_concurrent", 0)
+    monkeypatch.setattr(llm, "queue_limit", 0)
+
+    response = suggest(api)
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def test_first_token_timeout_is_504(api, monkeypatch):
+    monkeypatch.setattr(llm, "provider", MockProvider(first_token_delay=1))
+    monkeypatch.setattr(llm, "first_token_timeout", 0.05)
+    monkeypatch.setattr(llm, "max_retries", 0)
+
+    assert suggest(api).status_code == 504
+
+
+def test_failure_mid_stream_ends_with_error_event(api, monkeypatch):
+    monkeypatch.setattr(llm, "provider", MockProvider(chunk_size=4, chunk_delay=1))
+    monkeypatch.setattr(llm, "total_timeout", 0.2)
+
+    response = suggest(api)
+    assert response.status_code == 200
+    *chunks, last = parse_sse(response.text)
+    assert base64.b64decode(chunks[0]["data"]).decode() == MockProvider.DEFAULT_TEXT[:4]
+    assert last["event"] == "error"
+    assert json.loads(last["data"])["status"] == 504
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from src.ai.suggest_cache import SuggestionCache
+from src.exceptions import ServiceBusyError
+
+
+async def test_concurrent_requests_share_one_upstream_call():
+    cache = SuggestionCache(ttl_seconds=60, max_entries=10, max_bytes=1024)
+    calls = 0
+
+    async def produce():
+        nonlocal calls
+        calls += 1
+        for chunk in ("Write ", "the ", "report"):
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def read(title):
+        return "".join([chunk async for chunk in cache.stream(title, produce)])
+
+    results = await asyncio.gather(read("Write report"), read("write report!"))
+    assert results == ["Write the report"] * 2
+    assert await read("Write report") == "Write the report"
+    assert calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_subscribers_are_released_when_generation_is_cancelled():
+    cache = SuggestionCache(ttl_seconds=60, max_entries=10, max_bytes=1024)
+
+    async def produce():
+        yield "partial"
+        await asyncio.Event().wait()
+
+    stream = cache.stream("Write report", produce)
+    assert await anext(stream) == "partial"
+    for task in cache._tasks:
+        task.cancel()
+    with pytest.raises(ServiceBusyError):
+        await asyncio.wait_for(anext(stream), timeout=1)
+    assert cache.get("write report") is None
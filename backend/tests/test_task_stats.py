@@ -0,0 +1,90 @@
+"""task_stats stays equal to the tasks table under concurrent writes.
+
+Many writers, each on its own session and connection, create, update and
+delete overlapping tasks of one user at the same time, with a
+reconcile_task_stats-style rebuild running mid-way; afterwards
+find_stats_drift must report nothing.
+"""
+import asyncio
+import random
+
+from src.database.core import AsyncSessionLocal, SessionLocal
+from src.entities.task import Status
+from src.exceptions import TaskNotFoundError
+from src.tasks import models, service
+from src.tasks.stats import apply_stats_delta, find_stats_drift, rebuild_task_stats
+
+WRITERS = 12
+OPERATIONS = 300
+
+
+def new_task(rng: random.Random) -> models.TaskCreate:
+    return models.TaskCreate(title="Concurrent task", description="Test task",
+                             total_minutes=rng.choice([0, 15, 30, 45, 60, 120]))
+
+
+def check_drift(user) -> list:
+    with SessionLocal() as db:
+        return find_stats_drift(db, user.get_uuid())
+
+
+def rebuild(user) -> None:
+    with SessionLocal() as db:
+        rebuild_task_stats(db, user.get_uuid())
+        db.commit()
+
+
+async def test_stats_match_tasks_after_concurrent_writes(db, user):
+    rng = random.Random(25)
+    seeded = await service.bulk_create_tasks(user, db, models.TaskBulkCreate(
+        items=[new_task(rng) for _ in range(12)]))
+    ids = [task.id for task in seeded.items]
+    # Corrupt the summary so the mid-run rebuild has drift to fix
+    await apply_stats_delta(db, user.get_uuid(), {Status.Todo: (5, 500)})
+    await db.commit()
+    slots = asyncio.Semaphore(WRITERS)
+    halfway = asyncio.Event()
+    done = 0
+
+    async def operation() -> None:
+        nonlocal done
+        kind = rng.choice(["create", "update", "update", "delete", "bulk_update", "bulk_delete"])
+        targets = rng.sample(ids, min(len(ids), 5))
+        async with slots, AsyncSessionLocal() as session:
+            try:
+                if kind == "create":
+                    ids.append((await service.create_task(user, session, new_task(rng))).id)
+                elif kind == "update":
+                    await service.update_task(user, session, targets[0], models.TaskUpdate(
+                        status=rng.choice(list(Status)), total_minutes=rng.choice([None, 10, 90])))
+                elif kind == "delete":
+                    await service.delete_task(user, session, targets[0])
+                elif kind == "bulk_update":
+                    # Mixed column sets, so the batch runs as several UPDATEs
+                    await service.bulk_update_tasks(user, session, models.TaskBulkUpdate(items=[
+                        models.TaskBulkUpdateItem(id=task_id, status=rng.choice(list(Status)))
+                        if n % 2 else models.TaskBulkUpdateItem(id=task_id, total_minutes=n * 10)
+                        for n, task_id in enumerate(targets)]))
+                else:
+                    await service.bulk_delete_tasks(user, session, models.TaskBulkDelete(
+                        ids=targets[:2]))
+            except TaskNotFoundError:
+                # Another writer deleted it first
+                pass
+        done += 1
+        if done == OPERATIONS // 2:
+            halfway.set()
+
+    async def rebuild_midway() -> None:
+        await halfway.wait()
+        await asyncio.to_thread(rebuild, user)
+
+    # Let every writer finish before asserting, so none is left holding
+    # row locks the fixture teardown would wait on
+    results = await asyncio.gather(rebuild_midway(), *(operation() for _ in range(OPERATIONS)),
+                                   return_exceptions=True)
+    assert [r for r in results if isinstance(r, BaseException)] == []
+
+    assert await asyncio.to_thread(check_drift, user) == []
+    stats = await service.get_task_stats(user, db)
+    assert stats.total_count == len((await service.get_tasks(user, db)).items)
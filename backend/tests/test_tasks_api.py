@@ -0,0 +1,61 @@
+from src.tasks import controller, models
+
+
+def create_tasks(client, headers, count: int) -> list[dict]:
+    response = client.post("/tasks/bulk", headers=headers, json={"items": [
+        {"title": f"Task {i}", "description": "Test task", "total_minutes": 15}
+        for i in range(count)]})
+    assert response.status_code == 201
+    return response.json()["items"]
+
+
+def test_list_is_capped_to_a_page(client, auth_headers):
+    create_tasks(client, auth_headers, 120)
+
+    response = client.get("/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == models.DEFAULT_PAGE_SIZE
+    rest = client.get("/tasks/", headers=auth_headers,
+                      params={"cursor": response.headers["X-Next-Cursor"]})
+    assert len(rest.json()) == 120 - models.DEFAULT_PAGE_SIZE
+    assert "X-Next-Cursor" not in rest.headers
+
+    too_large = client.get("/tasks/", headers=auth_headers, params={"limit": models.MAX_PAGE_SIZE + 1})
+    assert too_large.status_code == 422
+
+
+def test_list_pages_with_limit_and_cursor(client, auth_headers):
+    created = create_tasks(client, auth_headers, 5)
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/tasks/", headers=auth_headers, params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen += [task["id"] for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert sorted(seen) == sorted(task["id"] for task in created)
+
+
+def test_fast_list_path_matches_response_model(client, auth_headers, monkeypatch):
+    create_tasks(client, auth_headers, 3)
+    regular = client.get("/tasks/", headers=auth_headers)
+    monkeypatch.setattr(controller, "FAST_LIST_RESPONSES", True)
+    fast = client.get("/tasks/", headers=auth_headers)
+
+    assert fast.json() == regular.json()
+    assert [list(task) for task in fast.json()] == [list(task) for task in regular.json()]
+
+
+def test_negative_estimates_are_rejected(client, auth_headers):
+    response = client.post("/tasks/", headers=auth_headers,
+                           json={"title": "Task", "description": "Test task", "total_minutes": -5})
+    assert response.status_code == 422
+
+    [task] = create_tasks(client, auth_headers, 1)
+    response = client.put(f"/tasks/{task['id']}", headers=auth_headers, json={"total_minutes": -5})
+    assert response.status_code == 422
@@ -16,6 +16,27 @@ interface DailyReportProps {
   triggerRefresh: () => void;
 }
 
+// Rebuild streamed text from SSE frames: an event's data lines are joined
+// with newlines, and events are concatenated. The last, possibly incomplete
+// frame is left for the next read.
+function parseSseText(raw: string) {
+  const events = raw.split("\n\n");
+  events.pop();
+  return events
+    .map((event) => {
+      // The server ends a stream that fails midway with an `error` event
+      if (event.split("\n").includes("event: error")) {
+        throw new Error("Daily plan generation failed");
+      }
+      return event
+        .split("\n")
+        .filter((line) => line.startsWith("data:"))
+        .map((line) => line.slice(line.startsWith("data: ") ? 6 : 5))
+        .join("\n");
+    })
+    .join("");
+}
+
 // Utility to buffer only complete markdown blocks (render up to last newline)
 function getRenderableMarkdown(markdown: string) {
   const lastNewline = markdown.lastIndexOf("\n");
@@ -47,20 +68,17 @@ export default function DailyReport({ triggerRefresh }: DailyReportProps) {
           },
         }
       );
+      if (!response.ok) throw new Error(`Request failed: ${response.status}`);
       if (!response.body) throw new Error("No response body");
       const reader = response.body.getReader();
+      const decoder = new TextDecoder();
       let result = "";
       while (true) {
         const { value, done } = await reader.read();
         if (done) break;
-        result += new TextDecoder().decode(value);
-        // Extract only the chunk after 'data: '
-        const matches = result.match(/data: ([^\n]*)/g);
-        let text = "";
-        if (matches) {
-          text = matches.map((m) => m.replace("data: ", "")).join("");
-        }
-        setStreamedPlan(text);
+        // stream: true keeps multi-byte characters split across reads intact
+        result += decoder.decode(value, { stream: true });
+        setStreamedPlan(parseSseText(result));
       }
     } catch {
       setError("Failed to generate daily plan");
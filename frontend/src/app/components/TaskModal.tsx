@@ -158,6 +158,8 @@ export default function TaskModal({
                           body: JSON.stringify({ title }),
                         }
                       );
+                      if (!response.ok)
+                        throw new Error(`Request failed: ${response.status}`);
                       if (!response.body) throw new Error("No response body");
                       const reader = response.body.getReader();
                       let buffer = "";
@@ -166,6 +168,10 @@ export default function TaskModal({
                         if (done) break;
                         const chunk = new TextDecoder().decode(value);
                         chunk.split("\n").forEach((line) => {
+                          // A stream that fails midway ends with an error event
+                          if (line === "event: error") {
+                            throw new Error("Suggestion failed");
+                          }
                           if (line.startsWith("data: ")) {
                             const b64 = line.replace("data: ", "");
                             if (b64.trim()) buffer += atob(b64);
@@ -11,6 +11,8 @@ import DailyReport from "./DailyReport";
 
 const backendUrl =
   process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8000";
+// The API's maximum page size
+const TASKS_PAGE_SIZE = 500;
 
 interface TasksListProps {
   onTaskChange: () => void;
@@ -24,19 +26,30 @@ export default function TasksList({ onTaskChange }: TasksListProps) {
   const [showModal, setShowModal] = useState(false);
   const [selectedIndex, setSelectedIndex] = useState(0);
 
-  const fetchTasks = useCallback(() => {
+  const fetchTasks = useCallback(async () => {
     if (!accessToken) {
       setLoading(false);
       return;
     }
     setLoading(true);
-    api
-      .get(`${backendUrl}/tasks/`, {
-        headers: { Authorization: `Bearer ${accessToken}` },
-      })
-      .then((res) => setTasks(res.data))
-      .catch((e) => console.log(e))
-      .finally(() => setLoading(false));
+    try {
+      // The list is paged; follow X-Next-Cursor until the last page
+      const all: Task[] = [];
+      let cursor: string | undefined;
+      do {
+        const res = await api.get(`${backendUrl}/tasks/`, {
+          headers: { Authorization: `Bearer ${accessToken}` },
+          params: { limit: TASKS_PAGE_SIZE, cursor },
+        });
+        all.push(...res.data);
+        cursor = res.headers["x-next-cursor"];
+      } while (cursor);
+      setTasks(all);
+    } catch (e) {
+      console.log(e);
+    } finally {
+      setLoading(false);
+    }
   }, [accessToken]);
 
   useEffect(() => {